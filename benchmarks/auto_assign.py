@@ -0,0 +1,139 @@
+"""Assignment throughput and load balance of the automatic assigner.
+
+Pure in-memory simulation, no database: --tickets arrive in rounds of
+--batch-size, workers with different speeds close a share of their open
+tickets every round, and the assigner only learns about closed tickets when
+it resyncs every --resync-rounds rounds (as AUTO_ASSIGN_RESYNC_SECONDS does).
+The least-loaded heap is compared with round robin and random picks.
+
+    python -m benchmarks.auto_assign --workers 50 --tickets 100000
+"""
+import argparse
+import itertools
+import json
+import random
+import statistics
+import time
+
+from src.tasks import WorkerLoadBalancer
+
+
+class LeastLoaded:
+    def __init__(self, loads: dict[int, int]):
+        self.balancer = WorkerLoadBalancer()
+        self.balancer.reset(loads)
+
+    def resync(self, loads: dict[int, int]):
+        self.balancer.reset(loads)
+
+    def take(self, count: int) -> list[int]:
+        return self.balancer.take(count)
+
+
+class RoundRobin:
+    def __init__(self, loads: dict[int, int]):
+        self.cycle = itertools.cycle(sorted(loads))
+
+    def resync(self, loads: dict[int, int]):
+        pass
+
+    def take(self, count: int) -> list[int]:
+        return list(itertools.islice(self.cycle, count))
+
+
+class RandomPick:
+    def __init__(self, loads: dict[int, int], seed: int = 0):
+        self.workers = sorted(loads)
+        self.rng = random.Random(seed)
+
+    def resync(self, loads: dict[int, int]):
+        pass
+
+    def take(self, count: int) -> list[int]:
+        return self.rng.choices(self.workers, k=count)
+
+
+STRATEGIES = {
+    "least_loaded": LeastLoaded,
+    "round_robin": RoundRobin,
+    "random": RandomPick,
+}
+
+
+def load_spread(loads: dict[int, int]) -> dict:
+    values = list(loads.values())
+    return {
+        "max": max(values),
+        "min": min(values),
+        "spread": max(values) - min(values),
+        "stdev": round(statistics.pstdev(values), 2),
+    }
+
+
+def simulate(strategy_class, args) -> dict:
+    rng = random.Random(args.seed)
+    loads = {worker_id: rng.randint(0, args.initial_load) for worker_id in range(1, args.workers + 1)}
+    # Share of its open tickets each worker closes per round.
+    speeds = {worker_id: rng.uniform(args.min_speed, args.max_speed) for worker_id in loads}
+
+    strategy = strategy_class(dict(loads))
+    pick_seconds = 0.0
+    spreads = []
+    stdevs = []
+    remaining = args.tickets
+
+    for round_number in itertools.count():
+        if remaining <= 0:
+            break
+        if round_number % args.resync_rounds == 0:
+            strategy.resync(dict(loads))
+
+        count = min(args.batch_size, remaining)
+        start = time.perf_counter()
+        picks = strategy.take(count)
+        pick_seconds += time.perf_counter() - start
+        remaining -= count
+
+        for worker_id in picks:
+            loads[worker_id] += 1
+        for worker_id, load in loads.items():
+            loads[worker_id] = load - int(load * speeds[worker_id] + rng.random())
+
+        spread = load_spread(loads)
+        spreads.append(spread["spread"])
+        stdevs.append(spread["stdev"])
+
+    return {
+        "assignments_per_second": round(args.tickets / pick_seconds) if pick_seconds else None,
+        "rounds": len(spreads),
+        "spread_mean": round(statistics.fmean(spreads), 2),
+        "spread_max": max(spreads),
+        "stdev_mean": round(statistics.fmean(stdevs), 2),
+        "final": load_spread(loads),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--tickets", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--resync-rounds", type=int, default=15)
+    parser.add_argument("--initial-load", type=int, default=20)
+    parser.add_argument("--min-speed", type=float, default=0.02)
+    parser.add_argument("--max-speed", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    report = {
+        "workers": args.workers,
+        "tickets": args.tickets,
+        "batch_size": args.batch_size,
+        "resync_rounds": args.resync_rounds,
+        "strategies": {name: simulate(strategy_class, args) for name, strategy_class in STRATEGIES.items()},
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
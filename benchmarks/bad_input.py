@@ -0,0 +1,173 @@
+"""Malformed input check: every case has to be answered the way the API
+promises (a 4xx naming the problem, or a report), never with a 500 or an
+exception out of the app.
+
+  cursor  tampered keyset cursors on GET /tickets: a timezone-aware
+          timestamp, ids outside int4, and a real cursor as control.
+  batch   POST /client/tickets/batch with invalid items next to a valid
+          one (only the valid one is created, the others get an error in
+          their result), with no valid item (422), and without a token.
+  import  import_tickets() on files that become unreadable after the first
+          chunk (a byte that is not UTF-8, a CSV field over the csv module's
+          size limit): the rows before it are imported and the report sets
+          failed_at_row and error instead of raising.
+
+Exits non-zero if any case fails.
+
+    python -m benchmarks.bad_input
+"""
+import argparse
+import asyncio
+import base64
+import csv
+import io
+import json
+import sys
+import uuid
+
+from src.main import app
+from src.database import async_sessionmaker, engine
+from src.core.enums import TicketFileFormat
+from src.core.imports.services import import_tickets
+from benchmarks.common import ASGIClient, login
+
+
+def make_cursor(created_at: str, ticket_id) -> str:
+    payload = json.dumps([created_at, ticket_id])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip("=")
+
+
+async def expect_status(request, *expected_statuses: int) -> str | None:
+    # None when the response is as expected, otherwise what went wrong.
+    try:
+        response = await request
+    except Exception as exc:
+        return f"raised {type(exc).__name__}: {str(exc).splitlines()[0] if str(exc) else ''}"
+    if response.status_code not in expected_statuses:
+        expected = " or ".join(str(status) for status in expected_statuses)
+        return f"HTTP {response.status_code}, expected {expected}: {response.body[:200]!r}"
+    return None
+
+
+async def cursor_cases(client: ASGIClient, admin: dict) -> dict:
+    page = await client.get("/tickets", headers=admin, params={"limit": 1})
+    next_cursor = page.json()["next_cursor"]
+
+    def tickets(cursor: str):
+        return client.get("/tickets", headers=admin, params={"limit": 1, "cursor": cursor})
+
+    return {
+        "cursor with an aware timestamp": await expect_status(tickets(make_cursor("2026-01-01T00:00:00+00:00", 1)), 400),
+        "cursor with an id above int4": await expect_status(tickets(make_cursor("2026-01-01T00:00:00", 2 ** 31)), 400),
+        "cursor with id 0": await expect_status(tickets(make_cursor("2026-01-01T00:00:00", 0)), 400),
+        "cursor that is not base64 JSON": await expect_status(tickets("not-a-cursor"), 400),
+        "cursor from the previous page": await expect_status(tickets(next_cursor), 200) if next_cursor else None,
+    }
+
+
+async def batch_cases(client: ASGIClient, admin: dict) -> dict:
+    valid = {
+        "client_name": "Bad Input Check",
+        "client_email": f"bad-input-{uuid.uuid4().hex[:8]}@example.com",
+        "title": "Valid ticket next to invalid ones",
+        "description": "Created by benchmarks.bad_input"
+    }
+    invalid = [{**valid, "client_email": "not-an-email"}, {**valid, "title": ""}, "not an object"]
+
+    def batch(tickets: list, headers: dict | None = admin):
+        return client.post("/client/tickets/batch", json_body={"tickets": tickets}, headers=headers)
+
+    async def mixed_batch() -> str | None:
+        response = await batch([invalid[0], valid, *invalid[1:]])
+        if response.status_code != 201:
+            return f"HTTP {response.status_code}, expected 201: {response.body[:200]!r}"
+        body = response.json()
+        created = [item["index"] for item in body["results"] if item["ticket"]]
+        failed = [item["index"] for item in body["results"] if item["error"]]
+        if created != [1] or failed != [0, 2, 3]:
+            return f"created {created} and failed {failed}, expected [1] and [0, 2, 3]"
+        return None
+
+    return {
+        "batch with invalid items next to a valid one": await mixed_batch(),
+        "batch without a valid item": await expect_status(batch(invalid), 422),
+        # HTTPBearer answers a missing token with 403 in older FastAPI releases.
+        "batch without a token": await expect_status(batch([valid], headers={}), 401, 403),
+    }
+
+
+def import_file(run_id: str, rows: int, tail: bytes) -> bytes:
+    # Rows are about 100 bytes, so --import-rows of them span several of the
+    # text decoder's 8 KiB reads before the tail is reached.
+    lines = [b"title,description,client_name,client_email"]
+    lines += [
+        f"Bad input import {index},Line {index + 2} of a file that breaks later,"
+        f"Bad Input Import,bad-input-import-{run_id}@example.com".encode("utf-8")
+        for index in range(rows)
+    ]
+    return b"\r\n".join(lines) + b"\r\n" + tail
+
+
+async def import_cases(args) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+
+    async def import_until_broken(tail: bytes, expected_error: str) -> str | None:
+        stream = io.TextIOWrapper(io.BytesIO(import_file(run_id, args.import_rows, tail)), encoding="utf-8-sig", newline="")
+        try:
+            async with async_sessionmaker() as session:
+                report = await import_tickets(session, stream, TicketFileFormat.CSV, chunk_size=args.import_chunk_size)
+        except Exception as exc:
+            return f"raised {type(exc).__name__}: {exc}"
+        if not (report["error"] or "").startswith(expected_error):
+            return f"error is {report['error']!r}, expected {expected_error}"
+        if report["imported"] < args.import_chunk_size:
+            return f"imported {report['imported']} rows, expected at least the first chunk"
+        # The header is line 1, so every line before failed_at_row was imported.
+        if report["failed_at_row"] != report["imported"] + 2:
+            return f"failed_at_row is {report['failed_at_row']} after {report['imported']} imported rows"
+        return None
+
+    return {
+        "import with a byte that is not UTF-8 after the first chunk": await import_until_broken(
+            b"Broken \xff title,Description,Bad Input Import,bad@example.com\r\n", "UnicodeDecodeError"
+        ),
+        "import with an oversized CSV field after the first chunk": await import_until_broken(
+            b'"' + b"x" * (csv.field_size_limit() + 1) + b'",Description,Bad Input Import,bad@example.com\r\n',
+            "Error"
+        ),
+    }
+
+
+async def run(args) -> dict:
+    client = ASGIClient(app)
+    admin = await login(client, args.admin, args.admin_password)
+    results = {}
+    results.update(await cursor_cases(client, admin))
+    results.update(await batch_cases(client, admin))
+    results.update(await import_cases(args))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--admin", default="admin")
+    parser.add_argument("--admin-password", default="admin123")
+    parser.add_argument("--import-rows", type=int, default=500)
+    parser.add_argument("--import-chunk-size", type=int, default=50)
+    args = parser.parse_args()
+
+    async def run_and_dispose():
+        try:
+            return await run(args)
+        finally:
+            await engine.dispose()
+
+    results = asyncio.run(run_and_dispose())
+    for name, problem in results.items():
+        print(f"{'FAIL' if problem else 'ok  '} {name}{': ' + problem if problem else ''}")
+    if any(results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
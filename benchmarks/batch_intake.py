@@ -0,0 +1,101 @@
+"""Ticket intake throughput: POST /client/tickets one by one versus
+POST /client/tickets/batch.
+
+Submits --tickets tickets through each path (spread over --clients distinct
+client emails) and reports tickets/sec and database round trips per ticket.
+
+    python -m benchmarks.batch_intake --tickets 2000 --batch-size 200
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from src.main import app
+from src.database import engine
+from benchmarks.common import ASGIClient, QueryCounter, login
+
+
+def ticket_payloads(count: int, clients: int, run_id: str) -> list[dict]:
+    return [
+        {
+            "client_name": f"Intake Client {i % clients}",
+            "client_email": f"intake-{run_id}-{i % clients}@example.com",
+            "title": f"Intake benchmark ticket {i}",
+            "description": "Submitted by benchmarks.batch_intake"
+        }
+        for i in range(count)
+    ]
+
+
+async def run_single(client: ASGIClient, payloads: list[dict], concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def submit(payload):
+        async with semaphore:
+            response = await client.post("/client/tickets", json_body=payload)
+            if response.status_code != 201:
+                raise RuntimeError(f"Single intake failed: {response.status_code} {response.body!r}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*[submit(payload) for payload in payloads])
+    return time.perf_counter() - start
+
+
+async def run_batch(client: ASGIClient, admin: dict, payloads: list[dict], batch_size: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, len(payloads), batch_size):
+        response = await client.post(
+            "/client/tickets/batch",
+            json_body={"tickets": payloads[offset:offset + batch_size]},
+            headers=admin
+        )
+        if response.status_code != 201:
+            raise RuntimeError(f"Batch intake failed: {response.status_code} {response.body!r}")
+    return time.perf_counter() - start
+
+
+async def run(args):
+    client = ASGIClient(app)
+    admin = await login(client, args.admin, args.admin_password)
+    run_id = uuid.uuid4().hex[:8]
+    report = {}
+
+    with QueryCounter(engine) as counter:
+        elapsed = await run_single(client, ticket_payloads(args.tickets, args.clients, f"{run_id}s"), args.concurrency)
+        report["single"] = {
+            "tickets": args.tickets,
+            "seconds": round(elapsed, 3),
+            "tickets_per_second": round(args.tickets / elapsed, 1),
+            "queries_per_ticket": round(counter.take() / args.tickets, 2),
+        }
+
+        elapsed = await run_batch(client, admin, ticket_payloads(args.tickets, args.clients, f"{run_id}b"), args.batch_size)
+        report["batch"] = {
+            "tickets": args.tickets,
+            "batch_size": args.batch_size,
+            "seconds": round(elapsed, 3),
+            "tickets_per_second": round(args.tickets / elapsed, 1),
+            "queries_per_ticket": round(counter.take() / args.tickets, 2),
+        }
+
+    report["speedup"] = round(report["batch"]["tickets_per_second"] / report["single"]["tickets_per_second"], 1)
+    print(json.dumps(report, indent=2))
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--admin", default="admin")
+    parser.add_argument("--admin-password", default="admin123")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
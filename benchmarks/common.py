@@ -0,0 +1,171 @@
+"""Shared helpers for the benchmark scripts: an in-process ASGI client and
+latency summaries. Requests go straight into the app, so the numbers include
+routing, validation, services and the database, but no network or server."""
+import asyncio
+import json
+import time
+from urllib.parse import urlencode
+
+from sqlalchemy import event
+
+
+class ASGIResponse:
+    def __init__(self, status_code: int, headers: list, body: bytes):
+        self.status_code = status_code
+        self.headers = {key.decode('latin-1'): value.decode('latin-1') for key, value in headers}
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class ASGIClient:
+    def __init__(self, app):
+        self.app = app
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        json_body=None,
+        headers: dict | None = None,
+        params: dict | None = None,
+        raw_body: bytes | None = None
+    ):
+        body = json.dumps(json_body).encode('utf-8') if json_body is not None else raw_body or b""
+        raw_headers = [(b"host", b"benchmark")]
+        if json_body is not None:
+            raw_headers.append((b"content-type", b"application/json"))
+        for key, value in (headers or {}).items():
+            raw_headers.append((key.lower().encode('latin-1'), value.encode('latin-1')))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode('utf-8'),
+            "root_path": "",
+            "query_string": urlencode(params or {}, doseq=True).encode('utf-8'),
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("benchmark", 80),
+        }
+
+        request_sent = False
+        response_done = asyncio.Event()
+        response = {"status": 500, "headers": [], "body": []}
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        await self.app(scope, receive, send)
+        response_done.set()
+        return ASGIResponse(response["status"], response["headers"], b"".join(response["body"]))
+
+    async def get(self, path: str, **kwargs):
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs):
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs):
+        return await self.request("PUT", path, **kwargs)
+
+    async def patch(self, path: str, **kwargs):
+        return await self.request("PATCH", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs):
+        return await self.request("DELETE", path, **kwargs)
+
+
+class QueryCounter:
+    """Counts database round trips (statements and commits) on an engine."""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.count = 0
+
+    def on_execute(self, *args):
+        self.count += 1
+
+    def on_commit(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self.on_execute)
+        event.listen(self.engine, "commit", self.on_commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self.on_execute)
+        event.remove(self.engine, "commit", self.on_commit)
+
+    def take(self) -> int:
+        count, self.count = self.count, 0
+        return count
+
+
+async def timed(coro) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = await coro
+    return time.perf_counter() - start, result
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: list[float], elapsed: float | None = None) -> dict:
+    summary = {
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 2),
+    }
+    if elapsed:
+        summary["throughput_rps"] = round(len(latencies) / elapsed, 1)
+    return summary
+
+
+def compare_reports(baseline: dict, current: dict, keys=("p50_ms", "p99_ms", "queries_per_request", "throughput_rps")) -> dict:
+    comparison = {}
+    for name, stats in current.items():
+        before = baseline.get(name)
+        if not isinstance(stats, dict) or not isinstance(before, dict):
+            continue
+        comparison[name] = {
+            key: {"before": before[key], "after": stats[key]}
+            for key in keys
+            if key in stats and key in before
+        }
+    return comparison
+
+
+async def login(client: ASGIClient, username: str, password: str) -> dict:
+    response = await client.post("/auth/login", json_body={"username": username, "password": password})
+    if response.status_code != 200:
+        raise RuntimeError(f"Login as {username} failed: {response.status_code} {response.body!r}")
+    token = response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,179 @@
+"""Deadlock check for concurrent ticket writes.
+
+  reassign  --pairs pairs of tickets, one assigned to worker A and one to
+            worker B, are swapped with PATCH /tickets/{id}/assign in
+            opposite directions at the same time, --iterations times. Both
+            requests of a pair update the same two ticket_counters rows.
+  batches   --batches POST /client/tickets/batch requests at a time share
+            the same --clients client emails, every other one in reverse
+            order, and rename them, --iterations times.
+
+Every request has to succeed and the counters (of both workers, and the
+overall total) have to match the tickets table afterwards; any error (a deadlock shows up as one) makes the
+script exit non-zero.
+
+    python -m benchmarks.concurrent_writes --pairs 20 --batches 4 --iterations 50
+"""
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from collections import Counter
+
+from sqlalchemy import func, select, true
+
+from src.main import app
+from src.database import async_sessionmaker, engine
+from src.core.counters import ticket_total_statement
+from src.core.models import Ticket
+from benchmarks.common import ASGIClient, login
+
+
+def error_name(exc: Exception) -> str:
+    return "deadlock" if "deadlock detected" in str(exc) else type(exc).__name__
+
+
+async def checked(request, expected_status: int, errors: Counter):
+    try:
+        response = await request
+    except Exception as exc:
+        errors[error_name(exc)] += 1
+        return None
+    if response.status_code != expected_status:
+        errors[f"HTTP {response.status_code}"] += 1
+        return None
+    return response
+
+
+async def worker_ids(client: ASGIClient, admin: dict) -> tuple[int, int]:
+    response = await client.get("/users", headers=admin, params={"limit": 100})
+    workers = [user["id"] for user in response.json()["users"] if user["role"] == "WORKER"]
+    if len(workers) < 2:
+        raise RuntimeError("Needs at least two workers, run seed.py generate first")
+    return workers[0], workers[1]
+
+
+async def counters_match(worker_ids: tuple[int | None, ...]) -> bool:
+    # None stands for all tickets.
+    async with async_sessionmaker() as session:
+        for worker_id in worker_ids:
+            counted = await session.scalar(ticket_total_statement(None, worker_id))
+            actual = await session.scalar(
+                select(func.count()).select_from(Ticket).where(
+                    Ticket.assigned_to_id == worker_id if worker_id is not None else true()
+                )
+            )
+            if counted != actual:
+                print(f"ticket_counters say {worker_id or 'all'} has {counted} tickets, tickets table has {actual}")
+                return False
+    return True
+
+
+async def run_reassign(client: ASGIClient, admin: dict, args) -> dict:
+    worker_a, worker_b = await worker_ids(client, admin)
+    run_id = uuid.uuid4().hex[:8]
+    errors = Counter()
+
+    ticket_ids = []
+    for index in range(args.pairs * 2):
+        response = await client.post("/client/tickets", json_body={
+            "client_name": "Deadlock Check",
+            "client_email": f"deadlock-{run_id}@example.com",
+            "title": f"Deadlock check ticket {index}",
+            "description": "Created by benchmarks.concurrent_writes"
+        })
+        ticket_ids.append(response.json()["ticket"]["id"])
+
+    # pairs[i] = [ticket on worker A, ticket on worker B]
+    pairs = [ticket_ids[index:index + 2] for index in range(0, len(ticket_ids), 2)]
+    for ticket_a, ticket_b in pairs:
+        await client.patch(f"/tickets/{ticket_a}/assign", json_body={"assigned_to_id": worker_a}, headers=admin)
+        await client.patch(f"/tickets/{ticket_b}/assign", json_body={"assigned_to_id": worker_b}, headers=admin)
+
+    owners = (worker_a, worker_b)
+    for _ in range(args.iterations):
+        owners = owners[::-1]
+        await asyncio.gather(*[
+            checked(
+                client.patch(f"/tickets/{ticket_id}/assign", json_body={"assigned_to_id": owner}, headers=admin),
+                200,
+                errors
+            )
+            for ticket_a, ticket_b in pairs
+            for ticket_id, owner in ((ticket_a, owners[0]), (ticket_b, owners[1]))
+        ])
+
+    return {
+        "requests": args.pairs * 2 * args.iterations,
+        "errors": dict(errors),
+        "counters_match": await counters_match((worker_a, worker_b)),
+    }
+
+
+async def run_batches(client: ASGIClient, admin: dict, args) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    emails = [f"deadlock-{run_id}-{index}@example.com" for index in range(args.clients)]
+    errors = Counter()
+
+    def batch(iteration: int, reverse: bool) -> dict:
+        return {"tickets": [
+            {
+                "client_name": f"Deadlock Check {iteration}",
+                "client_email": email,
+                "title": f"Deadlock check batch ticket {iteration}",
+                "description": "Created by benchmarks.concurrent_writes"
+            }
+            for email in (emails[::-1] if reverse else emails)
+        ]}
+
+    for iteration in range(args.iterations):
+        await asyncio.gather(*[
+            checked(
+                client.post("/client/tickets/batch", json_body=batch(iteration, index % 2 == 1), headers=admin),
+                201,
+                errors
+            )
+            for index in range(args.batches)
+        ])
+
+    return {
+        "requests": args.batches * args.iterations,
+        "errors": dict(errors),
+        "counters_match": await counters_match((None,)),
+    }
+
+
+async def run(args) -> dict:
+    client = ASGIClient(app)
+    admin = await login(client, args.admin, args.admin_password)
+    return {
+        "reassign": await run_reassign(client, admin, args),
+        "batches": await run_batches(client, admin, args),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=20)
+    parser.add_argument("--batches", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=50, help="Clients shared by every batch")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--admin", default="admin")
+    parser.add_argument("--admin-password", default="admin123")
+    args = parser.parse_args()
+
+    async def run_and_dispose():
+        try:
+            return await run(args)
+        finally:
+            await engine.dispose()
+
+    report = asyncio.run(run_and_dispose())
+    print(json.dumps(report, indent=2))
+    if any(scenario["errors"] or not scenario["counters_match"] for scenario in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Fan-out of ticket events from one LISTEN connection to many subscribers.
+
+Opens --subscribers in-process subscribers on a TicketEventBroker (a share
+of them admins, the rest workers spread over --workers ids), then sends
+--events ticket events through pg_notify in batches of --batch-size per
+transaction and measures the time from commit until each subscriber has the
+event, plus the dispatch cost per event. No HTTP is involved: this is the
+broker's share of GET /tickets/events.
+
+    python -m benchmarks.event_fanout --subscribers 5000 --events 2000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from types import SimpleNamespace
+
+from src.database import async_sessionmaker, dedicated_engine, engine
+from src.events import TicketEventBroker, notify_ticket_events
+from src.core.enums import TicketEventType, UserRole
+from benchmarks.common import summarize
+
+
+class TimedBroker(TicketEventBroker):
+    # dispatch() runs on the event loop for every notification, so its cost
+    # bounds how many events per second one process can fan out.
+    dispatch_seconds = 0.0
+
+    def dispatch(self, *args):
+        start = time.perf_counter()
+        super().dispatch(*args)
+        self.dispatch_seconds += time.perf_counter() - start
+
+
+async def run(args) -> dict:
+    rng = random.Random(args.seed)
+    # A channel of its own, so running app servers do not see these events.
+    channel = f"ticket_events_benchmark_{int(time.time())}"
+    broker = TimedBroker(
+        dedicated_engine,
+        queue_size=args.queue_size,
+        max_subscribers=args.subscribers,
+        heartbeat_interval=15,
+        reconnect_interval=1,
+        channel=channel,
+    )
+
+    subscribers = []
+    for index in range(args.subscribers):
+        if index < args.subscribers * args.admin_share:
+            user = SimpleNamespace(id=-index - 1, role=UserRole.ADMIN)
+        else:
+            user = SimpleNamespace(id=rng.randint(1, args.workers), role=UserRole.WORKER)
+        subscribers.append(broker.subscribe(user))
+
+    latencies = []
+
+    async def consume(subscriber):
+        while (frame := await subscriber.queue.get()) is not None:
+            data = frame.split(b"data: ", 1)[1]
+            latencies.append(time.perf_counter() - json.loads(data)["sent"])
+
+    consumers = [asyncio.create_task(consume(subscriber)) for subscriber in subscribers]
+
+    await broker.start()
+    while not broker.connected:
+        await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    for batch_start in range(0, args.events, args.batch_size):
+        batch_end = min(batch_start + args.batch_size, args.events)
+        async with async_sessionmaker() as session:
+            sent = time.perf_counter()
+            await notify_ticket_events(session, [
+                {
+                    "event": TicketEventType.ASSIGNED.value,
+                    "ticket_id": index,
+                    "assigned_to_id": rng.randint(1, args.workers),
+                    "previous_assigned_to_id": rng.randint(1, args.workers),
+                    "sent": sent,
+                }
+                for index in range(batch_start, batch_end)
+            ], channel=channel)
+            await session.commit()
+
+    deadline = time.perf_counter() + args.timeout
+    while (broker.received < args.events or len(latencies) < broker.delivered) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    stats = broker.stats()
+    await broker.stop()
+    await asyncio.gather(*consumers)
+    await engine.dispose()
+
+    return {
+        "subscribers": args.subscribers,
+        "events_sent": args.events,
+        "events_received": stats["received"],
+        "deliveries": stats["delivered"],
+        "deliveries_per_event": round(stats["delivered"] / max(stats["received"], 1), 1),
+        "dropped_subscribers": stats["dropped_subscribers"],
+        "dispatch_us_per_event": round(broker.dispatch_seconds / max(stats["received"], 1) * 1e6, 1),
+        "delivery_latency": summarize(latencies, elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=500)
+    parser.add_argument("--admin-share", type=float, default=0.02)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--queue-size", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for deliveries after the last send")
+    parser.add_argument("--seed", type=int, default=1)
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
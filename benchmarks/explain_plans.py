@@ -0,0 +1,215 @@
+"""Plan regression check for the ticket service queries.
+
+Runs every listing, lookup and write service against the configured database
+inside a transaction that is rolled back, captures the SQL it emits and
+EXPLAINs each statement with sequential scans disabled. A statement fails the
+check when a scan of a ticket table is left as a Seq Scan (no index can serve
+it at all) or walks an index with no Index Cond and applies a Filter on columns
+no index of that table starts with (the index only provides the order, every
+row is still read). A Filter on an indexed column is left to the planner: it
+had an index for it and found walking another one cheaper. The script exits
+non-zero if any statement fails.
+
+    python -m benchmarks.explain_plans
+"""
+import asyncio
+import json
+import re
+import sys
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import async_sessionmaker, engine
+from src.tasks import AutoAssigner
+from src.core.crm import services
+from src.core.enums import TicketFileFormat, TicketListView, TicketSearchMode, TicketStatus, UserRole
+from src.core.models import Ticket, User
+
+
+# Tables whose size is bounded by statuses x workers, never by tickets.
+SCAN_ALLOWED = {"ticket_counters", "users"}
+
+SCAN_NODE_TYPES = {"Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+
+# Only these are EXPLAINed; SAVEPOINT and friends are captured too.
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+async def export_first_chunk(search: str | None, status: str | None, db_session: AsyncSession):
+    # export_tickets() opens its own session; hand it the scenario's one so the
+    # stream runs in the same transaction.
+    class BoundSession:
+        async def __aenter__(self):
+            return db_session
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    chunks = services.export_tickets(
+        search, TicketSearchMode.TITLE, status, TicketFileFormat.NDJSON, BoundSession
+    )
+    try:
+        await anext(chunks, None)
+    finally:
+        await chunks.aclose()
+
+
+async def auto_assign_round(db_session: AsyncSession):
+    assigner = AutoAssigner(engine, None, batch_size=10, resync_interval=0)
+    await assigner.resync(db_session)
+    await assigner.assign_batch(db_session)
+
+
+def build_scenarios(worker_id: int, ticket_id: int) -> dict:
+    full = TicketListView.FULL
+    summary = TicketListView.SUMMARY
+    return {
+        "all tickets": lambda db: services.get_all_tickets(0, 10, None, None, TicketSearchMode.TITLE, None, full, db),
+        "all tickets by status": lambda db: services.get_all_tickets(
+            0, 10, None, None, TicketSearchMode.TITLE, TicketStatus.NEW, full, db
+        ),
+        "all tickets title search": lambda db: services.get_all_tickets(
+            0, 10, None, "pump", TicketSearchMode.TITLE, None, full, db
+        ),
+        "all tickets full-text search": lambda db: services.get_all_tickets(
+            0, 10, None, "pump", TicketSearchMode.FULLTEXT, None, full, db
+        ),
+        "all tickets summary": lambda db: services.get_all_tickets(
+            0, 10, None, None, TicketSearchMode.TITLE, None, summary, db
+        ),
+        "my tickets": lambda db: services.get_my_tickets(
+            worker_id, 0, 10, None, None, TicketSearchMode.TITLE, None, full, db
+        ),
+        "my tickets by status": lambda db: services.get_my_tickets(
+            worker_id, 0, 10, None, None, TicketSearchMode.TITLE, TicketStatus.IN_PROGRESS, full, db
+        ),
+        "my tickets summary": lambda db: services.get_my_tickets(
+            worker_id, 0, 10, None, None, TicketSearchMode.TITLE, None, summary, db
+        ),
+        "ticket list version": lambda db: services.get_ticket_list_version(None, None, db),
+        "my ticket list version": lambda db: services.get_ticket_list_version(
+            TicketStatus.IN_PROGRESS, worker_id, db
+        ),
+        "user list version": lambda db: services.get_user_list_version(db),
+        "export": lambda db: export_first_chunk(None, None, db),
+        "export by status": lambda db: export_first_chunk(None, TicketStatus.NEW, db),
+        "export title search": lambda db: export_first_chunk("pump", None, db),
+        "assign ticket": lambda db: services.update_tickets([ticket_id], {"assigned_to_id": worker_id}, db),
+        "worker status update": lambda db: services.update_tickets(
+            [ticket_id], {"status": TicketStatus.IN_PROGRESS}, db, worker_id
+        ),
+        "auto-assign round": auto_assign_round,
+    }
+
+
+# Every column of every table, and whether some index starts with it.
+CATALOG_STATEMENT = text("""
+    SELECT c.relname, a.attname,
+           EXISTS (SELECT 1 FROM pg_index i WHERE i.indrelid = c.oid AND i.indkey[0] = a.attnum)
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_attribute a ON a.attrelid = c.oid
+    WHERE n.nspname = current_schema() AND c.relkind = 'r' AND a.attnum > 0 AND NOT a.attisdropped
+""")
+
+
+async def load_catalog(conn) -> dict[str, dict[str, bool]]:
+    catalog = {}
+    for relation, column_name, indexed in await conn.execute(CATALOG_STATEMENT):
+        catalog.setdefault(relation, {})[column_name] = indexed
+    return catalog
+
+
+def filter_columns(predicate: str, columns: dict[str, bool]) -> set[str]:
+    # Literals could contain anything that looks like a column name.
+    predicate = re.sub(r"'(?:[^']|'')*'", "", predicate)
+    return {word for word in re.findall(r"[a-z_][a-z0-9_]*", predicate) if word in columns}
+
+
+def find_unindexed_scans(plan: dict, catalog: dict[str, dict[str, bool]]) -> list[str]:
+    found = []
+    node_type = plan.get("Node Type")
+    relation = plan.get("Relation Name")
+    if node_type in SCAN_NODE_TYPES and relation not in SCAN_ALLOWED:
+        if node_type == "Seq Scan":
+            found.append(f"sequential scan on {relation}")
+        elif "Filter" in plan and "Index Cond" not in plan and "Recheck Cond" not in plan:
+            columns = catalog.get(relation, {})
+            if not any(columns[name] for name in filter_columns(plan["Filter"], columns)):
+                found.append(f"{node_type} using {plan.get('Index Name')} on {relation} with Filter: {plan['Filter']}")
+    for child in plan.get("Plans", []):
+        found.extend(find_unindexed_scans(child, catalog))
+    return found
+
+
+async def capture_statements(scenario) -> list[tuple[str, tuple]]:
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        # Write scenarios commit; with savepoints those commits stay inside the
+        # outer transaction, which is rolled back.
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                async with AsyncSession(bind=conn, join_transaction_mode="create_savepoint") as session:
+                    await scenario(session)
+            finally:
+                await transaction.rollback()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    return captured
+
+
+async def check_plans() -> int:
+    async with async_sessionmaker() as session:
+        result = await session.execute(select(User.id).where(User.role == UserRole.WORKER).limit(1))
+        worker_id = result.scalar_one_or_none() or 0
+        result = await session.execute(select(Ticket.id).order_by(Ticket.id).limit(1))
+        ticket_id = result.scalar_one_or_none() or 0
+
+    failures = 0
+
+    for name, scenario in build_scenarios(worker_id, ticket_id).items():
+        statements = [
+            (statement, parameters) for statement, parameters in await capture_statements(scenario)
+            if statement.lstrip().upper().startswith(EXPLAINABLE)
+        ]
+
+        async with engine.connect() as conn:
+            catalog = await load_catalog(conn)
+            await conn.execute(text("SET enable_seqscan = off"))
+            for statement, parameters in statements:
+                result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = result.scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                problems = find_unindexed_scans(plan[0]["Plan"], catalog)
+                if problems:
+                    failures += 1
+                    print(f"FAIL {name}: {'; '.join(problems)}")
+                    print(f"     {' '.join(statement.split())}")
+
+        print(f"checked {name}: {len(statements)} statements")
+
+    return failures
+
+
+async def main():
+    failures = await check_plans()
+    await engine.dispose()
+
+    if failures:
+        print(f"{failures} statements scan tickets without using an index for their predicates")
+        sys.exit(1)
+
+    print("All statements use an index")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""Latency of an unrelated endpoint while a burst of logins is hashing.
+
+Fires --logins concurrent logins (bcrypt verification) and meanwhile probes
+GET /auth/me every --probe-interval seconds. Hashing runs on the
+PASSWORD_HASH_WORKERS pool, so the probes should not wait behind the logins;
+compare runs with different pool sizes.
+
+    python -m benchmarks.login_storm --logins 100
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from src.main import app
+from src.database import engine
+from src.passwords import password_hasher
+from benchmarks.common import ASGIClient, login, summarize, timed
+
+
+async def probe(client: ASGIClient, headers: dict, interval: float, stop: asyncio.Event) -> list[float]:
+    latencies = []
+    while not stop.is_set():
+        elapsed, _ = await timed(client.get("/auth/me", headers=headers))
+        latencies.append(elapsed)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def run(args):
+    client = ASGIClient(app)
+    headers = await login(client, args.username, args.password)
+
+    baseline = []
+    for _ in range(20):
+        elapsed, _ = await timed(client.get("/auth/me", headers=headers))
+        baseline.append(elapsed)
+
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(client, headers, args.probe_interval, stop))
+
+    start = time.perf_counter()
+    login_results = await asyncio.gather(*[
+        timed(client.post("/auth/login", json_body={"username": args.username, "password": args.password}))
+        for _ in range(args.logins)
+    ])
+    storm_elapsed = time.perf_counter() - start
+
+    stop.set()
+    probe_latencies = await probe_task
+
+    statuses = {}
+    for _, response in login_results:
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    report = {
+        "hash_workers": password_hasher.workers,
+        "logins": summarize([elapsed for elapsed, _ in login_results], storm_elapsed),
+        "login_statuses": statuses,
+        "unrelated_endpoint_idle": summarize(baseline),
+        "unrelated_endpoint_during_storm": summarize(probe_latencies),
+    }
+    print(json.dumps(report, indent=2))
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
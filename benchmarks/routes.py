@@ -0,0 +1,254 @@
+"""End-to-end latency, throughput and queries per request for every route.
+
+Drives src.main:app in-process against the database configured in .env,
+which should be seeded first (python seed.py generate ...) so listings, search
+and deep pages see realistic volumes. Each scenario runs --iterations requests
+with --concurrency in flight and reports p50/p95/p99, throughput and database
+round trips (statements plus commits) per request. Scenarios that write
+create their own users and tickets. Save a run with --output on one commit
+and pass it as --compare on another to see before/after numbers.
+
+    python -m benchmarks.routes --iterations 200 --output after.json --compare before.json
+    python -m benchmarks.routes --only tickets_list
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from datetime import datetime
+from types import SimpleNamespace
+
+from src.main import app
+from src.database import engine
+from src.passwords import password_hasher
+from src.core.crm.services import encode_ticket_cursor
+from benchmarks.common import ASGIClient, QueryCounter, compare_reports, login, summarize, timed
+
+
+async def run_scenario(request, iterations: int, concurrency: int, expected: tuple, counter: QueryCounter) -> dict:
+    latencies = []
+    unexpected = Counter()
+    indexes = iter(range(iterations))
+
+    async def worker():
+        for index in indexes:
+            elapsed, response = await timed(request(index))
+            latencies.append(elapsed)
+            if response.status_code not in expected:
+                unexpected[response.status_code] += 1
+
+    counter.take()
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(latencies, elapsed)
+    summary["queries_per_request"] = round(counter.take() / iterations, 2)
+    if unexpected:
+        summary["unexpected_statuses"] = dict(unexpected)
+    return summary
+
+
+def ticket_payload(tag: str, index: int) -> dict:
+    return {
+        "client_name": f"Benchmark Client {index % 50}",
+        "client_email": f"bench-{tag}-{index % 50}@example.com",
+        "title": f"Washing machine is leaking {index}",
+        "description": "Created by benchmarks.routes; water under the machine after every cycle."
+    }
+
+
+async def build_scenarios(client: ASGIClient, args) -> list:
+    tag = f"{int(time.time()) % 100000}"
+    admin = await login(client, args.admin, args.admin_password)
+    worker_login = await client.post("/auth/login", json_body={"username": args.worker, "password": args.worker_password})
+    worker_id = worker_login.json()["user_id"]
+    worker = {"Authorization": f"Bearer {worker_login.json()['access_token']}"}
+    refresh_token = worker_login.json()["refresh_token"]
+
+    # Tickets for the write scenarios, one per iteration.
+    ticket_ids = []
+    for start in range(0, args.iterations + 50, 500):
+        count = min(500, args.iterations + 50 - start)
+        response = await client.post("/client/tickets/batch", json_body={
+            "tickets": [ticket_payload(tag, start + index) for index in range(count)]
+        }, headers=admin)
+        ticket_ids.extend(result["ticket"]["id"] for result in response.json()["results"])
+    bulk_ids = ticket_ids[args.iterations:]
+
+    # A cursor pointing --deep-skip rows into the listing.
+    deep = await client.get("/tickets", headers=admin, params={"skip": args.deep_skip, "limit": 1})
+    deep_tickets = deep.json()["tickets"]
+    deep_cursor = None
+    if deep_tickets:
+        deep_cursor = encode_ticket_cursor(SimpleNamespace(
+            created_at=datetime.fromisoformat(deep_tickets[0]["created_at"]),
+            id=deep_tickets[0]["id"]
+        ))
+
+    user_ids = {}
+
+    async def create_user(index):
+        response = await client.post("/users", headers=admin, json_body={
+            "username": f"b{tag}u{index}",
+            "email": f"bench-{tag}-user{index}@example.com",
+            "password": "benchmark123",
+            "full_name": "Benchmark User"
+        })
+        if response.status_code == 201:
+            user_ids[index] = response.json()["id"]
+        return response
+
+    import_body = "\n".join(
+        json.dumps({**ticket_payload(tag, index), "status": "CLOSED"}) for index in range(100)
+    ).encode("utf-8")
+
+    async def import_tickets(index):
+        # The ASGI client only sends JSON bodies, so build the multipart upload by hand.
+        boundary = "benchmarkboundary"
+        body = (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"history.ndjson\"\r\n"
+            f"Content-Type: application/octet-stream\r\n\r\n"
+        ).encode("utf-8") + import_body + f"\r\n--{boundary}--\r\n".encode("utf-8")
+        return await client.request("POST", "/imports/tickets", raw_body=body, headers={
+            **admin, "Content-Type": f"multipart/form-data; boundary={boundary}"
+        })
+
+    etags = {}
+
+    async def revalidate(path, headers):
+        # Polls with the ETag of the first response, as a dashboard would; the
+        # first call (the warmup) fetches it.
+        if path not in etags:
+            etags[path] = (await client.get(path, headers=headers)).headers.get("etag", "")
+        return await client.get(path, headers={**headers, "If-None-Match": etags[path]})
+
+    logins = max(1, args.iterations // 10)
+
+    # (name, request for iteration i, expected statuses, iterations)
+    return [
+        ("auth_login", lambda i: client.post(
+            "/auth/login", json_body={"username": args.worker, "password": args.worker_password}
+        ), (200,), logins),
+        ("auth_register", lambda i: client.post("/auth/register", json_body={
+            "username": f"b{tag}r{i}", "email": f"bench-{tag}-reg{i}@example.com",
+            "password": "benchmark123", "role": "WORKER"
+        }), (201,), logins),
+        ("auth_refresh", lambda i: client.post(
+            "/auth/refresh", json_body={"refresh_token": refresh_token}
+        ), (200,), args.iterations),
+        ("auth_me", lambda i: client.get("/auth/me", headers=worker), (200,), args.iterations),
+        ("client_create_ticket", lambda i: client.post(
+            "/client/tickets", json_body=ticket_payload(tag, i)
+        ), (201,), args.iterations),
+        ("client_create_ticket_batch", lambda i: client.post("/client/tickets/batch", json_body={
+            "tickets": [ticket_payload(tag, i * 100 + index) for index in range(100)]
+        }, headers=admin), (201,), max(1, args.iterations // 10)),
+        ("tickets_list", lambda i: client.get("/tickets", headers=admin), (200,), args.iterations),
+        ("tickets_list_summary", lambda i: client.get(
+            "/tickets", headers=admin, params={"view": "summary"}
+        ), (200,), args.iterations),
+        ("tickets_list_not_modified", lambda i: revalidate("/tickets", admin), (304,), args.iterations),
+        ("tickets_list_status", lambda i: client.get(
+            "/tickets", headers=admin, params={"status": "IN_PROGRESS"}
+        ), (200,), args.iterations),
+        ("tickets_list_search", lambda i: client.get(
+            "/tickets", headers=admin, params={"search": "leak"}
+        ), (200,), args.iterations),
+        ("tickets_list_fulltext", lambda i: client.get(
+            "/tickets", headers=admin, params={"search": "washing machine leaking", "search_mode": "FULLTEXT"}
+        ), (200,), args.iterations),
+        ("tickets_list_deep_skip", lambda i: client.get(
+            "/tickets", headers=admin, params={"skip": args.deep_skip}
+        ), (200,), args.iterations),
+        ("tickets_list_deep_cursor", lambda i: client.get(
+            "/tickets", headers=admin, params={"cursor": deep_cursor} if deep_cursor else {}
+        ), (200,), args.iterations),
+        ("tickets_my", lambda i: client.get("/tickets/my", headers=worker), (200,), args.iterations),
+        ("tickets_my_not_modified", lambda i: revalidate("/tickets/my", worker), (304,), args.iterations),
+        ("tickets_export", lambda i: client.get(
+            "/tickets/export", headers=admin, params={"search": f"leaking {i}", "status": "NEW"}
+        ), (200,), max(1, args.iterations // 10)),
+        ("tickets_assign", lambda i: client.patch(
+            f"/tickets/{ticket_ids[i]}/assign", headers=admin, json_body={"assigned_to_id": worker_id}
+        ), (200,), args.iterations),
+        ("tickets_update_status", lambda i: client.patch(
+            f"/tickets/{ticket_ids[i]}/status", headers=worker, json_body={"status": "IN_PROGRESS"}
+        ), (200,), args.iterations),
+        ("tickets_unassign", lambda i: client.delete(
+            f"/tickets/{ticket_ids[i]}/assign", headers=admin
+        ), (200,), args.iterations),
+        ("tickets_bulk_assign", lambda i: client.patch("/tickets/bulk/assign", headers=admin, json_body={
+            "ticket_ids": bulk_ids, "assigned_to_id": worker_id if i % 2 == 0 else None
+        }), (200,), max(1, args.iterations // 10)),
+        ("tickets_bulk_status", lambda i: client.patch("/tickets/bulk/status", headers=admin, json_body={
+            "ticket_ids": bulk_ids, "status": "IN_PROGRESS" if i % 2 == 0 else "NEW"
+        }), (200,), max(1, args.iterations // 10)),
+        ("users_create", create_user, (201,), logins),
+        ("users_list", lambda i: client.get("/users", headers=admin), (200,), args.iterations),
+        ("users_list_not_modified", lambda i: revalidate("/users", admin), (304,), args.iterations),
+        ("users_get", lambda i: client.get(
+            f"/users/{user_ids.get(i % logins, worker_id)}", headers=admin
+        ), (200,), args.iterations),
+        ("users_put", lambda i: client.put(
+            f"/users/{user_ids.get(i % logins, worker_id)}", headers=admin, json_body={"full_name": f"Benchmark User {i}"}
+        ), (200,), args.iterations),
+        ("users_patch", lambda i: client.patch(
+            f"/users/{user_ids.get(i % logins, worker_id)}", headers=admin, json_body={"is_active": True}
+        ), (200,), args.iterations),
+        ("users_delete", lambda i: client.delete(f"/users/{user_ids[i]}", headers=admin), (200,), logins),
+        ("imports_tickets", import_tickets, (200,), max(1, args.iterations // 10)),
+    ]
+
+
+async def run(args):
+    client = ASGIClient(app)
+    scenarios = await build_scenarios(client, args)
+
+    report = {}
+    with QueryCounter(engine) as counter:
+        for name, request, expected, iterations in scenarios:
+            if args.only and not any(pattern in name for pattern in args.only):
+                continue
+            # One untimed request warms caches and prepared statements; it is
+            # skipped for scenarios that consume a fresh row per iteration.
+            if args.warmup and name in (
+                "auth_me", "tickets_list", "tickets_my", "users_list",
+                "tickets_list_not_modified", "tickets_my_not_modified", "users_list_not_modified"
+            ):
+                await request(0)
+            report[name] = await run_scenario(request, iterations, args.concurrency, expected, counter)
+            print(f"{name}: {json.dumps(report[name])}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(json.dumps(compare_reports(baseline, report), indent=2))
+
+    password_hasher.shutdown()
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--deep-skip", type=int, default=5000, help="Offset used by the deep page scenarios")
+    parser.add_argument("--only", nargs="*", help="Run only scenarios whose name contains one of these")
+    parser.add_argument("--no-warmup", dest="warmup", action="store_false")
+    parser.add_argument("--admin", default="admin")
+    parser.add_argument("--admin-password", default="admin123")
+    parser.add_argument("--worker", default="worker")
+    parser.add_argument("--worker-password", default="worker123")
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""CPU cost of turning one listing page into a JSON body.
+
+Pure in-memory, no database: builds --page-sizes tickets and users once, then
+times the two ways a listing page becomes response bytes.
+
+  orm   ORM objects (tickets with client and assignee loaded) handed to the
+        route's response_model, validated with from_attributes and encoded by
+        FastAPI's default path, as GET /tickets and GET /users used to do.
+  rows  Core rows turned into dicts by ticket_row_to_response() and
+        user_row_to_response() and encoded with pydantic_core.to_json, as
+        they are now.
+
+Loading the rows themselves (and the identity map for ORM entities) is not
+included here; benchmarks.routes covers the whole request.
+
+    python -m benchmarks.serialization --page-sizes 10 100 --iterations 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from src.main import app
+from src.core.crm.routers import json_response
+from src.core.crm.services import ticket_row_to_response, user_row_to_response
+from src.core.enums import TicketPriority, TicketStatus, UserRole
+from src.core.models import Client, Ticket, User
+
+TicketRow = namedtuple("TicketRow", [
+    "id", "title", "description", "status", "priority", "client_id", "assigned_to_id",
+    "created_at", "updated_at", "closed_at", "client_name", "client_email",
+    "assignee_username", "assignee_full_name"
+])
+
+UserRow = namedtuple("UserRow", [
+    "id", "username", "email", "role", "full_name", "is_active", "created_at", "updated_at"
+])
+
+
+def response_field(path: str):
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+
+def build_users(count: int) -> list[UserRow]:
+    now = datetime(2026, 1, 1)
+    return [
+        UserRow(
+            id=index,
+            username=f"worker{index}",
+            email=f"worker{index}@example.com",
+            role=UserRole.WORKER,
+            full_name=f"Worker Number {index}",
+            is_active=True,
+            created_at=now - timedelta(days=index),
+            updated_at=now,
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def build_ticket_rows(count: int, users: list[UserRow]) -> list[TicketRow]:
+    now = datetime(2026, 1, 1)
+    rows = []
+    for index in range(1, count + 1):
+        # Two out of three tickets are assigned, like a busy queue.
+        user = users[index % len(users)] if index % 3 else None
+        rows.append(TicketRow(
+            id=index,
+            title=f"Washing machine is leaking {index}",
+            description="Water under the machine after every cycle, the seal looks worn. " * 3,
+            status=TicketStatus.IN_PROGRESS if user else TicketStatus.NEW,
+            priority=TicketPriority.MEDIUM,
+            client_id=index * 7,
+            assigned_to_id=user.id if user else None,
+            created_at=now - timedelta(minutes=index),
+            updated_at=now,
+            closed_at=None,
+            client_name=f"Client {index}",
+            client_email=f"client{index}@example.com",
+            assignee_username=user.username if user else None,
+            assignee_full_name=user.full_name if user else None,
+        ))
+    return rows
+
+
+def build_tickets(rows: list[TicketRow]) -> list[Ticket]:
+    assignees = {}
+    tickets = []
+    for row in rows:
+        assignee = None
+        if row.assigned_to_id is not None:
+            assignee = assignees.setdefault(row.assigned_to_id, User(
+                id=row.assigned_to_id, username=row.assignee_username, full_name=row.assignee_full_name
+            ))
+        tickets.append(Ticket(
+            id=row.id, title=row.title, description=row.description, status=row.status,
+            priority=row.priority, client_id=row.client_id, assigned_to_id=row.assigned_to_id,
+            created_at=row.created_at, updated_at=row.updated_at, closed_at=row.closed_at,
+            client=Client(id=row.client_id, name=row.client_name, email=row.client_email),
+            assigned_to_user=assignee,
+        ))
+    return tickets
+
+
+async def orm_body(field, content) -> bytes:
+    # What FastAPI does with a returned value when the route has a response_model.
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def measure(func, iterations: int) -> tuple[float, bytes]:
+    body = await func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    return (time.perf_counter() - start) / iterations, body
+
+
+async def compare(name: str, field, orm_content, rows_content, iterations: int) -> dict:
+    async def orm():
+        return await orm_body(field, orm_content())
+
+    async def rows():
+        return json_response(rows_content()).body
+
+    orm_seconds, orm_bytes = await measure(orm, iterations)
+    rows_seconds, rows_bytes = await measure(rows, iterations)
+    if json.loads(orm_bytes) != json.loads(rows_bytes):
+        raise AssertionError(f"{name}: the two paths produce different responses")
+
+    return {
+        "orm_us_per_page": round(orm_seconds * 1e6, 1),
+        "rows_us_per_page": round(rows_seconds * 1e6, 1),
+        "speedup": round(orm_seconds / rows_seconds, 2),
+        "body_bytes": len(rows_bytes),
+    }
+
+
+async def run(args) -> dict:
+    tickets_field = response_field("/tickets")
+    users_field = response_field("/users")
+
+    report = {}
+    for page_size in args.page_sizes:
+        users = build_users(page_size)
+        rows = build_ticket_rows(page_size, users)
+        tickets = build_tickets(rows)
+        orm_users = [User(**user._asdict()) for user in users]
+
+        report[page_size] = {
+            "tickets": await compare(
+                "tickets",
+                tickets_field,
+                lambda: {"total": 1000000, "tickets": tickets, "next_cursor": None},
+                lambda: {"total": 1000000, "tickets": [ticket_row_to_response(row) for row in rows], "next_cursor": None},
+                args.iterations,
+            ),
+            "users": await compare(
+                "users",
+                users_field,
+                lambda: {"total": 1000, "users": orm_users},
+                lambda: {"total": 1000, "users": [user_row_to_response(user) for user in users]},
+                args.iterations,
+            ),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
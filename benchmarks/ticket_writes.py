@@ -0,0 +1,92 @@
+"""Round trips and latency of the single-ticket write endpoints.
+
+Cycles one ticket through assign, status update and unassign --iterations
+times and reports per-endpoint latency and database round trips (statements
+plus commits) per request. Save a run with --output on one commit and pass
+it as --compare on another to see before/after numbers side by side.
+
+    python -m benchmarks.ticket_writes --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import json
+
+from src.main import app
+from src.database import engine
+from benchmarks.common import ASGIClient, QueryCounter, compare_reports, login, summarize, timed
+
+
+async def run(args):
+    client = ASGIClient(app)
+    admin = await login(client, args.admin, args.admin_password)
+    worker_login = await client.post("/auth/login", json_body={"username": args.worker, "password": args.worker_password})
+    worker_id = worker_login.json()["user_id"]
+    worker = {"Authorization": f"Bearer {worker_login.json()['access_token']}"}
+
+    created = await client.post("/client/tickets", json_body={
+        "client_name": "Benchmark Client",
+        "client_email": "benchmark-writes@example.com",
+        "title": "Benchmark ticket",
+        "description": "Created by benchmarks.ticket_writes"
+    })
+    ticket_id = created.json()["ticket"]["id"]
+
+    operations = {
+        "assign": lambda: client.patch(
+            f"/tickets/{ticket_id}/assign", json_body={"assigned_to_id": worker_id}, headers=admin
+        ),
+        "update_status": lambda: client.patch(
+            f"/tickets/{ticket_id}/status", json_body={"status": "IN_PROGRESS"}, headers=worker
+        ),
+        "unassign": lambda: client.delete(f"/tickets/{ticket_id}/assign", headers=admin),
+    }
+    latencies = {name: [] for name in operations}
+    queries = {name: 0 for name in operations}
+
+    # Warm-up pass so auth lookups and prepared statements are cached.
+    for operation in operations.values():
+        await operation()
+
+    with QueryCounter(engine) as counter:
+        for _ in range(args.iterations):
+            for name, operation in operations.items():
+                counter.take()
+                elapsed, response = await timed(operation())
+                if response.status_code != 200:
+                    raise RuntimeError(f"{name} failed: {response.status_code} {response.body!r}")
+                latencies[name].append(elapsed)
+                queries[name] += counter.take()
+
+    report = {}
+    for name in operations:
+        report[name] = summarize(latencies[name])
+        report[name]["queries_per_request"] = round(queries[name] / args.iterations, 2)
+
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(json.dumps(compare_reports(baseline, report), indent=2))
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--admin", default="admin")
+    parser.add_argument("--admin-password", default="admin123")
+    parser.add_argument("--worker", default="worker")
+    parser.add_argument("--worker-password", default="worker123")
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,46 @@ DB_PORT = os.getenv("DB_PORT")
 DB_PASS = os.getenv("DB_PASS")
 DB_NAME = os.getenv("DB_NAME")
 
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+DB_REPLICA_HOST = os.getenv("DB_REPLICA_HOST")
+DB_REPLICA_PORT = os.getenv("DB_REPLICA_PORT", DB_PORT)
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))
+DB_REPLICA_CHECK_TIMEOUT = float(os.getenv("DB_REPLICA_CHECK_TIMEOUT", "1"))
+
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
-JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
\ No newline at end of file
+JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+if PASSWORD_HASH_WORKERS < 1:
+    raise ValueError(f"PASSWORD_HASH_WORKERS must be at least 1, got {PASSWORD_HASH_WORKERS}")
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "64"))
+AUTO_ASSIGN_ENABLED = os.getenv("AUTO_ASSIGN_ENABLED", "false").lower() == "true"
+AUTO_ASSIGN_INTERVAL_SECONDS = float(os.getenv("AUTO_ASSIGN_INTERVAL_SECONDS", "2"))
+AUTO_ASSIGN_BATCH_SIZE = int(os.getenv("AUTO_ASSIGN_BATCH_SIZE", "100"))
+AUTO_ASSIGN_RESYNC_SECONDS = float(os.getenv("AUTO_ASSIGN_RESYNC_SECONDS", "30"))
+
+JOB_RUNNER_CONCURRENCY = int(os.getenv("JOB_RUNNER_CONCURRENCY", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "1000"))
+JOB_DRAIN_TIMEOUT_SECONDS = float(os.getenv("JOB_DRAIN_TIMEOUT_SECONDS", "10"))
+
+SQL_STATS_HEADERS = os.getenv("SQL_STATS_HEADERS", "false").lower() == "true"
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+SQL_SLOW_QUERY_SAMPLE_RATE = float(os.getenv("SQL_SLOW_QUERY_SAMPLE_RATE", "0.1"))
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+
+EVENTS_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("EVENTS_SUBSCRIBER_QUEUE_SIZE", "256"))
+EVENTS_MAX_SUBSCRIBERS = int(os.getenv("EVENTS_MAX_SUBSCRIBERS", "10000"))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+EVENTS_RECONNECT_SECONDS = float(os.getenv("EVENTS_RECONNECT_SECONDS", "2"))
@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from src.database import async_sessionmaker, engine
+from src.core.enums import TicketFileFormat
+from src.core.imports.services import IMPORT_CHUNK_SIZE, guess_file_format, import_tickets
+
+
+def print_progress(report):
+    elapsed = report.to_response()
+    print(
+        f"{report.total_rows} rows read, {report.imported} imported, {report.failed} failed "
+        f"({elapsed['rows_per_second']:,.0f} rows/s)"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Import historical tickets and clients from CSV or NDJSON.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=[file_format.value for file_format in TicketFileFormat],
+                        help="Defaults to the file extension (.csv, .ndjson, .jsonl)")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows per transaction")
+    args = parser.parse_args()
+
+    file_format = TicketFileFormat(args.format) if args.format else guess_file_format(args.path)
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            async with async_sessionmaker() as session:
+                report = await import_tickets(session, stream, file_format, args.chunk_size, print_progress)
+    finally:
+        await engine.dispose()
+
+    print(json.dumps(report, indent=2))
+    if report["error"]:
+        # The chunks before failed_at_row are committed; re-run from there.
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,28 @@
+"""add ticket keyset index
+
+Revision ID: 3c9e1f27b8d4
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 09:12:41.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f27b8d4'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tickets_created_at_id', 'tickets', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tickets_created_at_id', table_name='tickets')
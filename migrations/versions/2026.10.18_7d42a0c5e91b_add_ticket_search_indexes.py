@@ -0,0 +1,62 @@
+"""add ticket search indexes
+
+Revision ID: 7d42a0c5e91b
+Revises: 3c9e1f27b8d4
+Create Date: 2026-10-18 10:03:17.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d42a0c5e91b'
+down_revision: Union[str, Sequence[str], None] = '3c9e1f27b8d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Adding a STORED generated column rewrites the table under an ACCESS
+    # EXCLUSIVE lock; on a large tickets table run this in a maintenance window.
+    op.add_column('tickets', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', description), 'B')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tickets_search_vector',
+            'tickets',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_tickets_title_trgm',
+            'tickets',
+            ['title'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tickets_title_trgm', table_name='tickets', postgresql_concurrently=True)
+        op.drop_index('ix_tickets_search_vector', table_name='tickets', postgresql_concurrently=True)
+    op.drop_column('tickets', 'search_vector')
@@ -0,0 +1,28 @@
+"""add ticket updated_at index
+
+Revision ID: 9b3e6f1a2c57
+Revises: e2a7d9c4f318
+Create Date: 2026-10-18 16:05:12.402917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3e6f1a2c57'
+down_revision: Union[str, Sequence[str], None] = 'e2a7d9c4f318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tickets_updated_at', 'tickets', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tickets_updated_at', table_name='tickets')
@@ -0,0 +1,59 @@
+"""add ticket access path indexes
+
+Revision ID: b5f8c2d1a4e7
+Revises: 7d42a0c5e91b
+Create Date: 2026-10-18 11:26:05.307744
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5f8c2d1a4e7'
+down_revision: Union[str, Sequence[str], None] = '7d42a0c5e91b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tickets_status_created_at_id',
+            'tickets',
+            ['status', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_tickets_assigned_to_id_created_at_id',
+            'tickets',
+            ['assigned_to_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_tickets_assigned_to_id_status_created_at_id',
+            'tickets',
+            ['assigned_to_id', 'status', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+        op.create_index('ix_tickets_client_id', 'tickets', ['client_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tickets_client_id', table_name='tickets', postgresql_concurrently=True)
+        op.drop_index(
+            'ix_tickets_assigned_to_id_status_created_at_id',
+            table_name='tickets',
+            postgresql_concurrently=True
+        )
+        op.drop_index('ix_tickets_assigned_to_id_created_at_id', table_name='tickets', postgresql_concurrently=True)
+        op.drop_index('ix_tickets_status_created_at_id', table_name='tickets', postgresql_concurrently=True)
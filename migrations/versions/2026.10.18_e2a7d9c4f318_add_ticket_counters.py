@@ -0,0 +1,54 @@
+"""add ticket counters
+
+Revision ID: e2a7d9c4f318
+Revises: b5f8c2d1a4e7
+Create Date: 2026-10-18 12:41:52.864230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7d9c4f318'
+down_revision: Union[str, Sequence[str], None] = 'b5f8c2d1a4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ticket_counters',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column(
+        'status',
+        postgresql.ENUM('NEW', 'IN_PROGRESS', 'COMPLETED', 'CLOSED', name='ticketstatus', create_type=False),
+        nullable=False
+    ),
+    sa.Column('assigned_to_id', sa.Integer(), nullable=True),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['assigned_to_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_ticket_counters_status_assigned_to_id',
+        'ticket_counters',
+        ['status', 'assigned_to_id'],
+        unique=True,
+        postgresql_nulls_not_distinct=True
+    )
+    op.execute("""
+        INSERT INTO ticket_counters (status, assigned_to_id, count)
+        SELECT status, assigned_to_id, count(*)
+        FROM tickets
+        GROUP BY status, assigned_to_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ticket_counters_status_assigned_to_id', table_name='ticket_counters')
+    op.drop_table('ticket_counters')
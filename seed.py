@@ -1,11 +1,21 @@
+import argparse
 import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+
+import asyncpg
 import bcrypt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import async_sessionmaker
+from config import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER
+from src.database import async_sessionmaker, engine
+from src.core.counters import rebuild_ticket_counters
 from src.core.models import User
-from src.core.enums import UserRole
+from src.core.enums import UserRole, TicketStatus, TicketPriority
+from src.passwords import password_hasher
 
 
 async def create_user_if_not_exists(
@@ -71,12 +81,338 @@ async def seed_test_users():
         print("Database seeding completed!")
 
 
+FIRST_NAMES = (
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth",
+    "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Olena", "Andrii", "Iryna", "Dmytro", "Oksana", "Taras", "Natalia", "Serhii", "Yulia", "Mykola",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Wilson", "Anderson", "Taylor", "Thomas", "Moore", "Jackson", "Martin", "Lee", "Thompson", "White",
+    "Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko", "Oliinyk", "Melnyk", "Boiko", "Koval", "Moroz",
+)
+DEVICES = (
+    "Washing machine", "Dishwasher", "Refrigerator", "Oven", "Microwave", "Laptop", "Desktop PC", "Printer",
+    "Smartphone", "Tablet", "TV", "Air conditioner", "Boiler", "Water heater", "Coffee machine", "Vacuum cleaner",
+)
+PROBLEMS = (
+    "does not turn on", "makes a loud noise", "is leaking water", "shows an error code", "overheats",
+    "stopped working after a power cut", "has a cracked screen", "does not drain", "keeps restarting",
+    "smells like burning", "is very slow", "does not heat up", "has a broken door", "does not connect to Wi-Fi",
+)
+DETAILS = (
+    "The problem started last week.", "It happens every time I use it.", "It is still under warranty.",
+    "I already tried unplugging it and plugging it back in.", "The device is about three years old.",
+    "Please call before coming over.", "It worked fine until yesterday.", "A technician looked at it before.",
+    "I can bring it to the service center myself.", "The issue comes and goes.",
+)
+
+PRIORITY_WEIGHTS = {
+    TicketPriority.LOW: 30,
+    TicketPriority.MEDIUM: 45,
+    TicketPriority.HIGH: 20,
+    TicketPriority.URGENT: 5,
+}
+# Old tickets are almost all finished; the most recent ones are still open.
+RECENT_STATUS_WEIGHTS = {
+    TicketStatus.NEW: 45,
+    TicketStatus.IN_PROGRESS: 40,
+    TicketStatus.COMPLETED: 10,
+    TicketStatus.CLOSED: 5,
+}
+HISTORIC_STATUS_WEIGHTS = {
+    TicketStatus.NEW: 1,
+    TicketStatus.IN_PROGRESS: 3,
+    TicketStatus.COMPLETED: 26,
+    TicketStatus.CLOSED: 70,
+}
+RECENT_TICKET_SHARE = 0.02
+UNASSIGNED_NEW_SHARE = 0.6
+INACTIVE_WORKER_SHARE = 0.05
+
+USER_COLUMNS = ["id", "username", "email", "password_hash", "role", "full_name", "is_active", "created_at", "updated_at"]
+CLIENT_COLUMNS = ["id", "name", "email"]
+# search_vector is generated by Postgres and must not be part of the COPY.
+TICKET_COLUMNS = [
+    "id", "title", "description", "status", "priority", "client_id",
+    "assigned_to_id", "created_at", "updated_at", "closed_at"
+]
+
+
+def weighted(weights: dict) -> tuple[list, list]:
+    choices = list(weights)
+    cum_weights = []
+    total = 0
+    for choice in choices:
+        total += weights[choice]
+        cum_weights.append(total)
+    return choices, cum_weights
+
+
+async def reserve_ids(conn: asyncpg.Connection, table: str, count: int) -> int:
+    # Moves the table's id sequence past a block of `count` ids and returns the
+    # first one, so COPY can write explicit ids that tickets can reference.
+    # The lock keeps concurrent inserts from drawing ids in the middle.
+    async with conn.transaction():
+        await conn.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+        sequence = await conn.fetchval("SELECT pg_get_serial_sequence($1, 'id')", table)
+        first_id = await conn.fetchval("SELECT nextval($1)", sequence)
+        await conn.execute("SELECT setval($1, $2)", sequence, first_id + count - 1)
+    return first_id
+
+
+def connect():
+    return asyncpg.connect(user=DB_USER, password=DB_PASS, host=DB_HOST, port=DB_PORT, database=DB_NAME)
+
+
+async def copy_in_chunks(table: str, columns: list[str], rows, total: int, chunk_size: int, jobs: int):
+    # Rows are generated in a thread while `jobs` connections COPY earlier
+    # chunks, so Postgres work (generated columns, FK checks, indexes) runs in
+    # parallel; at most jobs + 1 chunks are held in memory.
+    queue = asyncio.Queue(maxsize=jobs)
+    start = time.perf_counter()
+    copied = 0
+
+    async def copier():
+        nonlocal copied
+        conn = await connect()
+        try:
+            while (chunk := await queue.get()) is not None:
+                await conn.copy_records_to_table(table, records=chunk, columns=columns)
+                copied += len(chunk)
+                print(f"{table}: {copied}/{total} rows ({copied / (time.perf_counter() - start):,.0f} rows/s)")
+        finally:
+            await conn.close()
+
+    async def producer():
+        chunks = iter(rows)
+        while chunk := await asyncio.to_thread(lambda: list(islice(chunks, chunk_size))):
+            await queue.put(chunk)
+        for _ in range(jobs):
+            await queue.put(None)
+
+    # If a copier fails the group cancels everything else, including a
+    # producer blocked on a full queue nobody drains any more.
+    try:
+        async with asyncio.TaskGroup() as group:
+            for _ in range(jobs):
+                group.create_task(copier())
+            group.create_task(producer())
+    except ExceptionGroup as error:
+        raise error.exceptions[0]
+
+
+async def drop_secondary_indexes(conn: asyncpg.Connection, table: str) -> list[str]:
+    # Building an index once after the load is far cheaper than maintaining it
+    # row by row; unique and primary key indexes stay to keep the data valid.
+    rows = await conn.fetch("""
+        SELECT indexrelid::regclass::text AS name, pg_get_indexdef(indexrelid) AS definition
+        FROM pg_index
+        WHERE indrelid = $1::regclass AND NOT indisunique AND NOT indisprimary
+    """, table)
+    for row in rows:
+        await conn.execute(f"DROP INDEX {row['name']}")
+    return [row["definition"] for row in rows]
+
+
+async def hash_password_pool(size: int) -> list[tuple[str, str]]:
+    # bcrypt is deliberately slow, so a handful of hashes are computed in
+    # parallel on the hashing pool and shared by all generated workers.
+    passwords = [f"worker{index}pass" for index in range(size)]
+    hashes = await asyncio.gather(*[password_hasher.hash(password) for password in passwords])
+    return list(zip(passwords, hashes))
+
+
+def generate_workers(first_id: int, count: int, prefix: str, password_pool: list, rng: random.Random, now: datetime):
+    for index in range(count):
+        created_at = now - timedelta(days=rng.randint(30, 1500))
+        yield (
+            first_id + index,
+            f"{prefix}_worker{index}",
+            f"{prefix}.worker{index}@example.com",
+            password_pool[index % len(password_pool)][1],
+            UserRole.WORKER.value,
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            rng.random() >= INACTIVE_WORKER_SHARE,
+            created_at,
+            created_at,
+        )
+
+
+def generate_clients(first_id: int, count: int, prefix: str, rng: random.Random):
+    for index in range(count):
+        yield (
+            first_id + index,
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            f"{prefix}.client{index}@example.com",
+        )
+
+
+def generate_tickets(
+    first_id: int,
+    count: int,
+    first_client_id: int,
+    client_count: int,
+    workers: list[tuple[int, bool]],
+    days: int,
+    rng: random.Random,
+    now: datetime
+):
+    priorities, priority_weights = weighted(PRIORITY_WEIGHTS)
+    recent_statuses, recent_weights = weighted(RECENT_STATUS_WEIGHTS)
+    historic_statuses, historic_weights = weighted(HISTORIC_STATUS_WEIGHTS)
+
+    # A few workers carry much more than the rest; open tickets only go to
+    # active workers.
+    worker_weights = {worker_id: 1 / (rank + 1) ** 0.8 for rank, (worker_id, _) in enumerate(workers)}
+    all_workers, all_worker_weights = weighted(worker_weights)
+    active_workers, active_worker_weights = weighted(
+        {worker_id: worker_weights[worker_id] for worker_id, is_active in workers if is_active}
+    )
+
+    start = now - timedelta(days=days)
+    step = days * 86400 / count
+    recent_from = count * (1 - RECENT_TICKET_SHARE)
+    choices = rng.choices
+    rand = rng.random
+
+    for index in range(count):
+        # Ids grow with created_at, like real intake.
+        created_at = start + timedelta(seconds=index * step + rand() * step)
+        if index >= recent_from:
+            status = choices(recent_statuses, cum_weights=recent_weights)[0]
+        else:
+            status = choices(historic_statuses, cum_weights=historic_weights)[0]
+
+        if status == TicketStatus.NEW and rand() < UNASSIGNED_NEW_SHARE:
+            assigned_to_id = None
+        elif status in (TicketStatus.NEW, TicketStatus.IN_PROGRESS):
+            assigned_to_id = choices(active_workers, cum_weights=active_worker_weights)[0]
+        else:
+            assigned_to_id = choices(all_workers, cum_weights=all_worker_weights)[0]
+
+        if status in (TicketStatus.COMPLETED, TicketStatus.CLOSED):
+            closed_at = min(created_at + timedelta(hours=1 + rand() * 24 * 14), now)
+            updated_at = closed_at
+        else:
+            closed_at = None
+            updated_at = created_at
+
+        device = choices(DEVICES)[0]
+        yield (
+            first_id + index,
+            f"{device} {choices(PROBLEMS)[0]}",
+            f"My {device.lower()} {choices(PROBLEMS)[0]}. {choices(DETAILS)[0]} {choices(DETAILS)[0]}",
+            status.value,
+            choices(priorities, cum_weights=priority_weights)[0].value,
+            # Squaring skews towards low ids: most clients have a ticket or two,
+            # a few have many.
+            first_client_id + int(client_count * rand() ** 2),
+            assigned_to_id,
+            created_at,
+            updated_at,
+            closed_at,
+        )
+
+
+async def generate_data(args):
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    prefix = args.prefix or f"gen{int(time.time())}"
+    started = time.perf_counter()
+
+    password_pool = await hash_password_pool(args.password_pool)
+    print(f"Hashed {len(password_pool)} passwords in {time.perf_counter() - started:.1f}s")
+
+    conn = await connect()
+    try:
+        first_worker_id = await reserve_ids(conn, "users", args.workers)
+        workers = list(generate_workers(first_worker_id, args.workers, prefix, password_pool, rng, now))
+        await copy_in_chunks("users", USER_COLUMNS, workers, args.workers, args.chunk_size, 1)
+
+        first_client_id = await reserve_ids(conn, "clients", args.clients)
+        await copy_in_chunks(
+            "clients", CLIENT_COLUMNS,
+            generate_clients(first_client_id, args.clients, prefix, rng),
+            args.clients, args.chunk_size, args.jobs
+        )
+
+        if args.tickets:
+            deferred_indexes = await drop_secondary_indexes(conn, "tickets") if args.defer_indexes else []
+            try:
+                first_ticket_id = await reserve_ids(conn, "tickets", args.tickets)
+                await copy_in_chunks(
+                    "tickets", TICKET_COLUMNS,
+                    generate_tickets(
+                        first_ticket_id, args.tickets, first_client_id, args.clients,
+                        [(worker[0], worker[6]) for worker in workers], args.days, rng, now
+                    ),
+                    args.tickets, args.chunk_size, args.jobs
+                )
+            finally:
+                # Also after a failed load: the app must never be left without
+                # the search and listing indexes.
+                for definition in deferred_indexes:
+                    index_started = time.perf_counter()
+                    await conn.execute(definition)
+                    print(f"{definition} ({time.perf_counter() - index_started:.1f}s)")
+
+        async with async_sessionmaker() as session:
+            await rebuild_ticket_counters(session)
+            await session.commit()
+        print("Rebuilt ticket counters")
+
+        await conn.execute("ANALYZE users, clients, tickets, ticket_counters")
+        print("Analyzed tables")
+    finally:
+        await conn.close()
+
+    print(f"Generated {args.workers} workers, {args.clients} clients and {args.tickets} tickets "
+          f"in {time.perf_counter() - started:.1f}s")
+    print(f"Workers log in as {prefix}_worker<N> with password worker<N % {len(password_pool)}>pass")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed test users or generate a large synthetic dataset.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("users", help="Create the admin and worker test accounts (default)")
+
+    generate = subparsers.add_parser("generate", help="Bulk-load synthetic workers, clients and tickets with COPY")
+    generate.add_argument("--workers", type=int, default=100)
+    generate.add_argument("--clients", type=int, default=10000)
+    generate.add_argument("--tickets", type=int, default=100000)
+    generate.add_argument("--days", type=int, default=3 * 365, help="Spread ticket creation over this many days")
+    generate.add_argument("--prefix", help="Username/email prefix, defaults to a timestamp so runs do not collide")
+    generate.add_argument("--password-pool", type=int, default=8, help="Distinct bcrypt hashes shared by workers")
+    generate.add_argument("--chunk-size", type=int, default=50000, help="Rows per COPY")
+    generate.add_argument("--jobs", type=int, default=4, help="Connections copying chunks in parallel")
+    generate.add_argument("--seed", type=int, default=1)
+    generate.add_argument(
+        "--defer-indexes", action="store_true",
+        help="Drop non-unique ticket indexes during the load and rebuild them after; "
+             "much faster for large loads, but queries run without them meanwhile"
+    )
+
+    args = parser.parse_args()
+    if args.command == "generate" and (args.workers < 1 or args.clients < 1 or args.jobs < 1):
+        parser.error("--workers, --clients and --jobs must be at least 1")
+    return args
+
+
 async def main():
+    args = parse_args()
     try:
-        await seed_test_users()
+        if args.command == "generate":
+            await generate_data(args)
+        else:
+            await seed_test_users()
     except Exception as e:
         print(f"Error during seeding: {e}")
         raise
+    finally:
+        password_hasher.shutdown()
+        await engine.dispose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+import time
+from collections import OrderedDict
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from config import CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS
+from src.core.models import Client, User
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self.entries.pop(key, None)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+# Entries are plain column values, never session-bound instances, so a cached
+# row can't be mutated or lazy-loaded through another request's session.
+user_cache = TTLCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+client_cache = TTLCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+
+
+def entity_values(instance) -> dict:
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(instance).mapper.column_attrs}
+
+
+def detached_entity(model, values: dict):
+    instance = model(**values)
+    make_transient_to_detached(instance)
+    return instance
+
+
+def cache_user(user: User):
+    user_cache.set(user.id, entity_values(user))
+
+
+def cache_client(client):
+    # Accepts a Client instance or a (id, name, email) result row.
+    client_cache.set(client.email, {"id": client.id, "name": client.name, "email": client.email})
+
+
+async def get_cached_user(user_id: int, db_session: AsyncSession, fill_cache: bool = True) -> User | None:
+    # Authentication reads this cache too, so a session on a lagging replica
+    # must pass fill_cache=False: a user deactivated a moment ago would stay
+    # active for the whole TTL otherwise.
+    values = user_cache.get(user_id)
+    if values is not None:
+        return detached_entity(User, values)
+
+    result = await db_session.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is not None and fill_cache:
+        cache_user(user)
+    return user
+
+
+def get_cached_client(email: str) -> Client | None:
+    values = client_cache.get(email)
+    if values is None:
+        return None
+    return detached_entity(Client, values)
+
+
+def cache_stats() -> dict:
+    return {
+        "users": user_cache.stats(),
+        "clients": client_cache.stats()
+    }
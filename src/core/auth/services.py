@@ -1,10 +1,11 @@
 import os
 import jwt
-import bcrypt
 from datetime import datetime, timedelta
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import get_cached_user
+from src.passwords import hash_password, verify_password
 from src.core.models import User
 
 
@@ -25,10 +26,7 @@ async def register_user(user_data, db_session: AsyncSession):
     if result.scalar_one_or_none():
         raise ValueError("Email already registered")
     
-    password_hash = bcrypt.hashpw(
-        user_data.password.encode('utf-8'), 
-        bcrypt.gensalt()
-    ).decode('utf-8')
+    password_hash = await hash_password(user_data.password)
     
     db_user = User(
         username=user_data.username,
@@ -53,10 +51,7 @@ async def authenticate_user(login_data, db_session: AsyncSession):
     result = await db_session.execute(stmt)
     user = result.scalar_one_or_none()
     
-    if user is None or not bcrypt.checkpw(
-        login_data.password.encode('utf-8'),
-        user.password_hash.encode('utf-8')
-    ):
+    if user is None or not await verify_password(login_data.password, user.password_hash):
         raise ValueError("Invalid credentials")
     
     if not user.is_active:
@@ -87,9 +82,7 @@ async def refresh_access_token(refresh_token_str: str, db_session: AsyncSession)
     if user_id is None:
         raise ValueError("Invalid refresh token")
     
-    stmt = select(User).where(User.id == int(user_id))
-    result = await db_session.execute(stmt)
-    user = result.scalar_one_or_none()
+    user = await get_cached_user(int(user_id), db_session)
     
     if user is None or not user.is_active:
         raise ValueError("User not found or inactive")
@@ -134,9 +127,7 @@ async def get_current_user(token: str, db_session: AsyncSession):
     except jwt.InvalidTokenError:
         raise ValueError("Invalid token")
     
-    stmt = select(User).where(User.id == int(user_id))
-    result = await db_session.execute(stmt)
-    user = result.scalar_one_or_none()
+    user = await get_cached_user(int(user_id), db_session)
     
     if user is None:
         raise ValueError("User not found")
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import get_async_session
-from src.core.client.schemas import TicketCreateRequest, TicketCreateResponse
-from src.core.client.services import create_ticket_with_client
+from src.security import require_admin
+from src.core.client.schemas import (
+    TicketCreateRequest,
+    TicketCreateResponse,
+    TicketBatchCreateRequest,
+    TicketBatchCreateResponse
+)
+from src.core.client.services import create_ticket_with_client, create_tickets_batch
 
 
 router = APIRouter(prefix="/client", tags=["Client"])
@@ -14,3 +20,18 @@ async def submit_ticket(
     session: AsyncSession = Depends(get_async_session)
 ):
     return await create_ticket_with_client(session, ticket_data)
+
+
+@router.post("/tickets/batch", response_model=TicketBatchCreateResponse, status_code=201)
+async def submit_tickets_batch(
+    batch_data: TicketBatchCreateRequest,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    admin_user = Depends(require_admin)
+):
+    # Up to 500 tickets per call, each of which can rename its client: meant
+    # for partner portals signed in with an admin account, not for the public.
+    result = await create_tickets_batch(session, batch_data)
+    if not result.created:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return result
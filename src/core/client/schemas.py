@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
+from typing import Any
 from src.core.enums import TicketStatus, TicketPriority
 
 
@@ -36,3 +37,28 @@ class TicketCreateResponse(BaseModel):
     ticket: TicketResponse
     client: ClientResponse
     message: str = "Ticket created successfully"
+
+
+class TicketBatchCreateRequest(BaseModel):
+    # Items are validated one by one as TicketCreateRequest by the service, so
+    # an invalid item is reported in its result instead of rejecting the batch.
+    tickets: list[Any] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="TicketCreateRequest objects"
+    )
+
+
+class TicketBatchItemResult(BaseModel):
+    index: int
+    ticket: TicketResponse | None = None
+    client: ClientResponse | None = None
+    error: str | None = None
+
+
+class TicketBatchCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[TicketBatchItemResult]
+    message: str = "Tickets created successfully"
@@ -1,51 +1,168 @@
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.cache import cache_client, detached_entity, get_cached_client
+from src.core.counters import record_ticket_changes
+from src.core.enums import TicketStatus
 from src.core.models import Client, Ticket
-from src.core.client.schemas import TicketCreateRequest, TicketCreateResponse, ClientResponse, TicketResponse
+from src.events import notify_ticket_events, ticket_created_event
+from src.tasks import schedule_auto_assign
+from src.core.client.schemas import (
+    TicketCreateRequest,
+    TicketCreateResponse,
+    ClientResponse,
+    TicketResponse,
+    TicketBatchCreateRequest,
+    TicketBatchCreateResponse,
+    TicketBatchItemResult
+)
 
 
-async def get_or_create_client(session: AsyncSession, name: str, email: str) -> Client:
-    result = await session.execute(
-        select(Client).where(Client.email == email)
-    )
-    client = result.scalar_one_or_none()
+TICKET_RESPONSE_COLUMNS = (
+    Ticket.id,
+    Ticket.title,
+    Ticket.description,
+    Ticket.status,
+    Ticket.priority,
+    Ticket.client_id,
+    Ticket.created_at
+)
 
-    if client:
-        if client.name != name:
-            client.name = name
-            await session.commit()
-            await session.refresh(client)
-        return client
 
-    new_client = Client(name=name, email=email)
-    session.add(new_client)
-    await session.commit()
-    await session.refresh(new_client)
-    return new_client
+async def upsert_clients(session: AsyncSession, names_by_email: dict[str, str]) -> dict:
+    # Always written through, so a rename made by another process or an import
+    # is never hidden behind this process's cache. A client whose name already
+    # matches is left untouched and not returned by the upsert.
+    # The upsert locks client rows in VALUES order; sorting by email keeps
+    # concurrent batches that share clients from deadlocking.
+    stmt = pg_insert(Client).values([
+        {"name": name, "email": email} for email, name in sorted(names_by_email.items())
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Client.email],
+        set_={"name": stmt.excluded.name},
+        where=Client.name.is_distinct_from(stmt.excluded.name)
+    ).returning(Client.id, Client.name, Client.email)
+
+    result = await session.execute(stmt)
+    clients = {row.email: row for row in result.all()}
+
+    # Those need their id, which never changes: the cache saves that read.
+    unread = []
+    for email, name in names_by_email.items():
+        if email in clients:
+            continue
+        cached = get_cached_client(email)
+        if cached is not None:
+            clients[email] = detached_entity(Client, {"id": cached.id, "name": name, "email": email})
+        else:
+            unread.append(email)
+
+    if unread:
+        result = await session.execute(
+            select(Client.id, Client.name, Client.email).where(Client.email.in_(unread))
+        )
+        clients.update({row.email: row for row in result.all()})
+
+    return clients
 
 
 async def create_ticket_with_client(
     session: AsyncSession,
     ticket_data: TicketCreateRequest
 ) -> TicketCreateResponse:
-    client = await get_or_create_client(
-        session=session,
-        name=ticket_data.client_name,
-        email=ticket_data.client_email
-    )
+    # One upsert creates or renames the client, race-free against concurrent
+    # first submissions.
+    clients = await upsert_clients(session, {ticket_data.client_email: ticket_data.client_name})
+    client = clients[ticket_data.client_email]
 
-    ticket = Ticket(
+    stmt = insert(Ticket.__table__).values(
         title=ticket_data.title,
         description=ticket_data.description,
+        status=TicketStatus.NEW,
         client_id=client.id
-    )
+    ).returning(*TICKET_RESPONSE_COLUMNS)
+    result = await session.execute(stmt)
+    ticket = result.one()
 
-    session.add(ticket)
+    await record_ticket_changes(session, [(None, (TicketStatus.NEW, None))])
+    await notify_ticket_events(session, [ticket_created_event(ticket)])
     await session.commit()
-    await session.refresh(ticket)
+    cache_client(client)
+    schedule_auto_assign()
 
     return TicketCreateResponse(
         ticket=TicketResponse.model_validate(ticket),
         client=ClientResponse.model_validate(client),
         message="Ticket created successfully"
     )
+
+
+def validation_error_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'ticket'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+async def create_tickets_batch(
+    session: AsyncSession,
+    batch_data: TicketBatchCreateRequest
+) -> TicketBatchCreateResponse:
+    results = []
+    items = []
+    for index, raw_item in enumerate(batch_data.tickets):
+        try:
+            items.append((index, TicketCreateRequest.model_validate(raw_item)))
+        except ValidationError as e:
+            results.append(TicketBatchItemResult(index=index, error=validation_error_message(e)))
+
+    if not items:
+        return TicketBatchCreateResponse(
+            created=0,
+            failed=len(results),
+            results=results,
+            message="No valid tickets in the batch"
+        )
+
+    # Later items win for the client name, as if they were submitted one by one.
+    names_by_email = {item.client_email: item.client_name for _, item in items}
+    clients = await upsert_clients(session, names_by_email)
+
+    stmt = insert(Ticket.__table__).returning(*TICKET_RESPONSE_COLUMNS, sort_by_parameter_order=True)
+    result = await session.execute(stmt, [
+        {
+            "title": item.title,
+            "description": item.description,
+            "status": TicketStatus.NEW,
+            "client_id": clients[item.client_email].id
+        }
+        for _, item in items
+    ])
+    tickets = result.all()
+
+    await record_ticket_changes(session, [(None, (TicketStatus.NEW, None))] * len(tickets))
+    await notify_ticket_events(session, [ticket_created_event(ticket) for ticket in tickets])
+    await session.commit()
+
+    for client in clients.values():
+        cache_client(client)
+    schedule_auto_assign()
+
+    results.extend(
+        TicketBatchItemResult(
+            index=index,
+            ticket=TicketResponse.model_validate(ticket),
+            client=ClientResponse.model_validate(clients[item.client_email])
+        )
+        for (index, item), ticket in zip(items, tickets)
+    )
+    results.sort(key=lambda item_result: item_result.index)
+
+    return TicketBatchCreateResponse(
+        created=len(tickets),
+        failed=len(results) - len(tickets),
+        results=results,
+        message="Tickets created successfully" if len(tickets) == len(results) else "Some tickets were not created"
+    )
@@ -0,0 +1,96 @@
+from collections import Counter
+
+from sqlalchemy import select, func, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.enums import TicketStatus
+from src.core.models import Ticket, TicketCounter
+
+
+# A counter key is the (status, assigned_to_id) pair a ticket is counted under.
+TicketCounterKey = tuple[TicketStatus, int | None]
+
+
+def ticket_counter_deltas(changes: list[tuple[TicketCounterKey | None, TicketCounterKey | None]]) -> Counter:
+    deltas = Counter()
+
+    for old_key, new_key in changes:
+        if old_key == new_key:
+            continue
+        if old_key is not None:
+            deltas[old_key] -= 1
+        if new_key is not None:
+            deltas[new_key] += 1
+
+    return deltas
+
+
+def ticket_counter_lock_order(key: TicketCounterKey) -> tuple:
+    status, assigned_to_id = key
+    return status.value, assigned_to_id is None, assigned_to_id or 0
+
+
+async def apply_ticket_counter_deltas(db_session: AsyncSession, deltas: Counter):
+    # The upsert locks the counter rows in VALUES order. Every writer uses the
+    # same order, so two transactions moving tickets between the same workers
+    # in opposite directions queue up instead of deadlocking.
+    rows = [
+        {"status": status, "assigned_to_id": assigned_to_id, "count": deltas[(status, assigned_to_id)]}
+        for status, assigned_to_id in sorted(deltas, key=ticket_counter_lock_order)
+        if deltas[(status, assigned_to_id)]
+    ]
+    if not rows:
+        return
+
+    stmt = insert(TicketCounter).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TicketCounter.status, TicketCounter.assigned_to_id],
+        set_={"count": TicketCounter.count + stmt.excluded.count}
+    )
+    await db_session.execute(stmt)
+
+
+async def record_ticket_changes(
+    db_session: AsyncSession,
+    changes: list[tuple[TicketCounterKey | None, TicketCounterKey | None]]
+):
+    await apply_ticket_counter_deltas(db_session, ticket_counter_deltas(changes))
+
+
+def ticket_total_statement(status: str | None = None, assigned_to_id: int | None = None):
+    stmt = select(func.coalesce(func.sum(TicketCounter.count), 0))
+
+    if status:
+        stmt = stmt.where(TicketCounter.status == status)
+
+    if assigned_to_id is not None:
+        stmt = stmt.where(TicketCounter.assigned_to_id == assigned_to_id)
+
+    return stmt
+
+
+async def release_worker_ticket_counters(db_session: AsyncSession, user_id: int):
+    # Tickets of a deleted user become unassigned through ON DELETE SET NULL,
+    # so their counts move to the unassigned rows.
+    moved = select(TicketCounter.status, TicketCounter.count).where(
+        TicketCounter.assigned_to_id == user_id
+    )
+    result = await db_session.execute(moved)
+    deltas = Counter()
+    for status, count in result.all():
+        deltas[(status, None)] += count
+
+    await apply_ticket_counter_deltas(db_session, deltas)
+    await db_session.execute(delete(TicketCounter).where(TicketCounter.assigned_to_id == user_id))
+
+
+async def rebuild_ticket_counters(db_session: AsyncSession):
+    await db_session.execute(delete(TicketCounter))
+    await db_session.execute(
+        insert(TicketCounter).from_select(
+            ["status", "assigned_to_id", "count"],
+            select(Ticket.status, Ticket.assigned_to_id, func.count())
+            .group_by(Ticket.status, Ticket.assigned_to_id)
+        )
+    )
@@ -1,16 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.enums import TicketStatus
-from src.security import get_current_user
-from src.database import get_async_session
+from src.core.enums import TicketFileFormat, TicketListView, TicketSearchMode, TicketStatus
+from src.security import get_current_user, security
+from src.database import get_async_session, get_read_session, read_sessionmaker
+from src.etags import etag_headers, etag_matches, not_modified, request_etag
+from src.events import TooManySubscribers, ticket_event_broker
+from src.core.auth.services import decode_token
 from src.core.crm import services
 from src.security import require_admin, require_worker
 from src.core.crm.schemas import (
     TicketListResponse,
     TicketResponse,
+    TicketSummaryListResponse,
     UpdateTicketAssignmentRequest,
     UpdateTicketStatusRequest,
+    BulkTicketAssignmentRequest,
+    BulkTicketStatusRequest,
+    BulkTicketUpdateResponse,
     UserCreateRequest,
     UserUpdateRequest,
     UserPatchRequest,
@@ -19,6 +29,14 @@ from src.core.crm.schemas import (
 )
 
 
+def json_response(content, etag: str | None = None) -> Response:
+    # Listings are already plain dicts built from Core rows; returning a
+    # Response skips FastAPI's validate-and-encode pass over them, while
+    # response_model still documents the shape.
+    headers = etag_headers(etag) if etag is not None else None
+    return Response(to_json(content), media_type="application/json", headers=headers)
+
+
 user_managment_router = APIRouter(prefix="/users", tags=["Users Management"])
 
 
@@ -40,30 +58,47 @@ async def create_user(
 
 @user_managment_router.get("", response_model=UserListResponse)
 async def get_users(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     _: None = Depends(require_admin)
 ):
-    result = await services.get_users(skip, limit, db)
-    return result
+    # The version is read before the page, so a change landing in between
+    # only costs the client one extra full response.
+    version = await services.get_user_list_version(db)
+    etag = request_etag(request, version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    total, _ = version
+    result = await services.get_users(skip, limit, db, total)
+    return json_response(result, etag)
 
 
 @user_managment_router.get("/{user_id}", response_model=UserResponse)
 async def get_user_by_id(
     user_id: int,
-    db: AsyncSession = Depends(get_async_session),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_session),
     _: None = Depends(require_admin)
 ):
     try:
-        user = await services.get_user_by_id(user_id, db)
-        return user
+        # db may be a replica; its rows must not end up in the auth cache.
+        user = await services.get_user_by_id(user_id, db, fill_cache=False)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
 
+    etag = request_etag(request, user.updated_at)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return user
+
 
 @user_managment_router.put("/{user_id}", response_model=UserResponse)
 async def update_user(
@@ -118,29 +153,134 @@ async def delete_user(
 ticket_router = APIRouter(prefix="/tickets", tags=["Tickets Management"])
 
 
-@ticket_router.get("", response_model=TicketListResponse)
+@ticket_router.get("", response_model=TicketListResponse | TicketSummaryListResponse)
 async def get_all_tickets(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    search: str | None = Query(None, description="Search by ticket title"),
-    status: TicketStatus | None = Query(None, description="Filter by status"),
-    db: AsyncSession = Depends(get_async_session),
+    cursor: str | None = Query(None, description="Cursor from next_cursor of the previous page, replaces skip"),
+    search: str | None = Query(None, description="Search by ticket title, or title and description in FULLTEXT mode"),
+    search_mode: TicketSearchMode = Query(TicketSearchMode.TITLE, description="TITLE substring match or ranked FULLTEXT search"),
+    ticket_status: TicketStatus | None = Query(None, alias="status", description="Filter by status"),
+    view: TicketListView = Query(TicketListView.FULL, description="full tickets, or summary: id, title, status, priority, assignee name"),
+    db: AsyncSession = Depends(get_read_session),
     admin_user = Depends(require_admin)
 ):
-    result = await services.get_all_tickets(skip, limit, search, status, db)
-    return result
+    etag = request_etag(request, await services.get_ticket_list_version(ticket_status, None, db))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    try:
+        result = await services.get_all_tickets(skip, limit, cursor, search, search_mode, ticket_status, view, db)
+        return json_response(result, etag)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
-@ticket_router.get("/my", response_model=TicketListResponse)
+@ticket_router.get("/my", response_model=TicketListResponse | TicketSummaryListResponse)
 async def get_my_tickets(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    search: str | None = Query(None, description="Search by ticket title"),
-    status: TicketStatus | None = Query(None, description="Filter by status"),
-    db: AsyncSession = Depends(get_async_session),
+    cursor: str | None = Query(None, description="Cursor from next_cursor of the previous page, replaces skip"),
+    search: str | None = Query(None, description="Search by ticket title, or title and description in FULLTEXT mode"),
+    search_mode: TicketSearchMode = Query(TicketSearchMode.TITLE, description="TITLE substring match or ranked FULLTEXT search"),
+    ticket_status: TicketStatus | None = Query(None, alias="status", description="Filter by status"),
+    view: TicketListView = Query(TicketListView.FULL, description="full tickets, or summary: id, title, status, priority, assignee name"),
+    db: AsyncSession = Depends(get_read_session),
     current_worker = Depends(require_worker)
 ):
-    result = await services.get_my_tickets(current_worker.id, skip, limit, search, status, db)
+    etag = request_etag(request, current_worker.id, await services.get_ticket_list_version(ticket_status, current_worker.id, db))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    try:
+        result = await services.get_my_tickets(current_worker.id, skip, limit, cursor, search, search_mode, ticket_status, view, db)
+        return json_response(result, etag)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+TICKET_EXPORT_MEDIA_TYPES = {
+    TicketFileFormat.NDJSON: "application/x-ndjson",
+    TicketFileFormat.CSV: "text/csv",
+}
+
+
+@ticket_router.get("/export")
+async def export_tickets(
+    export_format: TicketFileFormat = Query(TicketFileFormat.NDJSON, alias="format", description="ndjson or csv"),
+    search: str | None = Query(None, description="Search by ticket title, or title and description in FULLTEXT mode"),
+    search_mode: TicketSearchMode = Query(TicketSearchMode.TITLE, description="TITLE substring match or ranked FULLTEXT search"),
+    ticket_status: TicketStatus | None = Query(None, alias="status", description="Filter by status"),
+    admin_user = Depends(require_admin)
+):
+    session_factory = read_sessionmaker()
+    return StreamingResponse(
+        services.export_tickets(search, search_mode, ticket_status, export_format, session_factory),
+        media_type=TICKET_EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="tickets.{export_format.value}"'}
+    )
+
+
+@ticket_router.get("/events")
+async def ticket_events(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_session),
+    current_user = Depends(get_current_user)
+):
+    # Server-Sent Events: admins see every ticket event, workers the events of
+    # their own tickets. The session used for authentication is the same one
+    # get_current_user got; it is closed now so an open stream holds no pool
+    # connection.
+    await db.close()
+    try:
+        subscriber = ticket_event_broker.subscribe(current_user)
+    except TooManySubscribers as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"}
+        )
+
+    expires_at = decode_token(credentials.credentials).get("exp")
+    return StreamingResponse(
+        ticket_event_broker.stream(subscriber, expires_at),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Declared before the /{ticket_id}/... routes, which would otherwise match "bulk".
+@ticket_router.patch("/bulk/assign", response_model=BulkTicketUpdateResponse)
+async def bulk_assign_tickets(
+    assignment_data: BulkTicketAssignmentRequest,
+    db: AsyncSession = Depends(get_async_session),
+    admin_user = Depends(require_admin)
+):
+    try:
+        result = await services.bulk_assign_tickets(assignment_data, db)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@ticket_router.patch("/bulk/status", response_model=BulkTicketUpdateResponse)
+async def bulk_update_ticket_status(
+    status_data: BulkTicketStatusRequest,
+    db: AsyncSession = Depends(get_async_session),
+    admin_user = Depends(require_admin)
+):
+    result = await services.bulk_update_ticket_status(status_data, db)
     return result
 
 
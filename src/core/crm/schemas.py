@@ -88,6 +88,23 @@ class TicketResponse(BaseModel):
 class TicketListResponse(BaseModel):
     total: int
     tickets: list[TicketResponse]
+    next_cursor: str | None = None
+
+
+class TicketSummaryResponse(BaseModel):
+    id: int
+    title: str
+    status: str
+    priority: str
+    assigned_to_id: int | None
+    assignee_name: str | None
+    created_at: datetime
+
+
+class TicketSummaryListResponse(BaseModel):
+    total: int
+    tickets: list[TicketSummaryResponse]
+    next_cursor: str | None = None
 
 
 class AssignWorkerRequest(BaseModel):
@@ -99,4 +116,21 @@ class UpdateTicketAssignmentRequest(BaseModel):
     status: TicketStatus | None = None
 
 class UpdateTicketStatusRequest(BaseModel):
-    status: TicketStatus
\ No newline at end of file
+    status: TicketStatus
+
+
+class BulkTicketAssignmentRequest(BaseModel):
+    ticket_ids: list[int] = Field(..., min_length=1, max_length=500)
+    assigned_to_id: int | None
+    status: TicketStatus | None = None
+
+
+class BulkTicketStatusRequest(BaseModel):
+    ticket_ids: list[int] = Field(..., min_length=1, max_length=500)
+    status: TicketStatus
+
+
+class BulkTicketUpdateResponse(BaseModel):
+    updated: int
+    missing_ids: list[int]
+    tickets: list[TicketResponse]
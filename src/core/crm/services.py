@@ -1,11 +1,22 @@
+import base64
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
 
-import bcrypt
-from sqlalchemy import select, func
+from pydantic_core import to_json
+
+from sqlalchemy import select, func, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
 
-from src.core.enums import UserRole
-from src.core.models import Ticket, User
+from src.cache import get_cached_user, user_cache
+from src.events import notify_ticket_events, ticket_changed_event
+from src.passwords import hash_password
+from src.core.counters import record_ticket_changes, release_worker_ticket_counters, ticket_total_statement
+from src.core.enums import TicketFileFormat, TicketListView, TicketSearchMode, UserRole
+from src.core.models import Client, Ticket, User
 
 
 async def create_user(user_data, db_session: AsyncSession):
@@ -19,10 +30,7 @@ async def create_user(user_data, db_session: AsyncSession):
     if result.scalar_one_or_none():
         raise ValueError("Email already registered")
     
-    password_hash = bcrypt.hashpw(
-        user_data.password.encode('utf-8'), 
-        bcrypt.gensalt()
-    ).decode('utf-8')
+    password_hash = await hash_password(user_data.password)
     
     db_user = User(
         username=user_data.username,
@@ -40,14 +48,35 @@ async def create_user(user_data, db_session: AsyncSession):
     return db_user
 
 
-async def get_users(skip: int, limit: int, db_session: AsyncSession):
-    count_stmt = select(func.count()).select_from(User)
-    total_result = await db_session.execute(count_stmt)
-    total = total_result.scalar()
-    
-    stmt = select(User).offset(skip).limit(limit)
+USER_RESPONSE_COLUMNS = User.__table__.c[
+    "id", "username", "email", "role", "full_name", "is_active", "created_at", "updated_at"
+]
+
+
+def user_row_to_response(row) -> dict:
+    return {
+        "id": row.id,
+        "username": row.username,
+        "email": row.email,
+        "role": row.role.value,
+        "full_name": row.full_name,
+        "is_active": row.is_active,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at
+    }
+
+
+async def get_users(skip: int, limit: int, db_session: AsyncSession, total: int | None = None):
+    if total is None:
+        count_stmt = select(func.count()).select_from(User)
+        total_result = await db_session.execute(count_stmt)
+        total = total_result.scalar()
+    
+    # Plain columns straight into response dicts: no identity map, and no
+    # password_hash leaving the database.
+    stmt = select(*USER_RESPONSE_COLUMNS).offset(skip).limit(limit)
     result = await db_session.execute(stmt)
-    users = result.scalars().all()
+    users = [user_row_to_response(row) for row in result]
     
     return {
         "total": total,
@@ -55,10 +84,14 @@ async def get_users(skip: int, limit: int, db_session: AsyncSession):
     }
 
 
-async def get_user_by_id(user_id: int, db_session: AsyncSession):
-    stmt = select(User).where(User.id == user_id)
-    result = await db_session.execute(stmt)
-    user = result.scalar_one_or_none()
+async def get_user_list_version(db_session: AsyncSession) -> tuple:
+    # Any insert, update or delete of a user moves one of these.
+    result = await db_session.execute(select(func.count(), func.max(User.updated_at)).select_from(User))
+    return tuple(result.one())
+
+
+async def get_user_by_id(user_id: int, db_session: AsyncSession, fill_cache: bool = True):
+    user = await get_cached_user(user_id, db_session, fill_cache)
     
     if user is None:
         raise ValueError("User not found")
@@ -89,10 +122,7 @@ async def update_user(user_id: int, user_data, db_session: AsyncSession):
         user.email = user_data.email
     
     if user_data.password:
-        password_hash = bcrypt.hashpw(
-            user_data.password.encode('utf-8'), 
-            bcrypt.gensalt()
-        ).decode('utf-8')
+        password_hash = await hash_password(user_data.password)
         user.password_hash = password_hash
     
     if user_data.full_name is not None:
@@ -106,6 +136,7 @@ async def update_user(user_id: int, user_data, db_session: AsyncSession):
     
     await db_session.commit()
     await db_session.refresh(user)
+    user_cache.invalidate(user.id)
     
     return user
 
@@ -135,10 +166,7 @@ async def patch_user(user_id: int, user_data, db_session: AsyncSession):
         user.email = update_data["email"]
     
     if "password" in update_data:
-        password_hash = bcrypt.hashpw(
-            update_data["password"].encode('utf-8'), 
-            bcrypt.gensalt()
-        ).decode('utf-8')
+        password_hash = await hash_password(update_data["password"])
         user.password_hash = password_hash
     
     if "full_name" in update_data:
@@ -152,6 +180,7 @@ async def patch_user(user_id: int, user_data, db_session: AsyncSession):
     
     await db_session.commit()
     await db_session.refresh(user)
+    user_cache.invalidate(user.id)
     
     return user
 
@@ -164,171 +193,488 @@ async def delete_user(user_id: int, db_session: AsyncSession):
     if user is None:
         raise ValueError("User not found")
     
+    await release_worker_ticket_counters(db_session, user.id)
     await db_session.delete(user)
     await db_session.commit()
+    user_cache.invalidate(user_id)
     
     return {"message": "User deleted successfully"}
 
 
-async def get_all_tickets(skip: int, limit: int, search: str | None, status: str | None, db_session: AsyncSession):
-    count_stmt = select(func.count()).select_from(Ticket)
-    stmt = select(Ticket).options(
-        selectinload(Ticket.client),
-        selectinload(Ticket.assigned_to_user)
-    )
-    
+TICKET_ID_MAX = 2 ** 31 - 1
+
+
+def encode_ticket_cursor(ticket) -> str:
+    payload = json.dumps([ticket.created_at.isoformat(), ticket.id])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip("=")
+
+
+def decode_ticket_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, ticket_id = json.loads(base64.urlsafe_b64decode(padded))
+        created_at, ticket_id = datetime.fromisoformat(created_at), int(ticket_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    # Cursors we issue carry a naive timestamp and a serial id; anything else
+    # would only fail later in the database, comparing against the naive
+    # created_at column or an int4 id.
+    if created_at.tzinfo is not None or not 1 <= ticket_id <= TICKET_ID_MAX:
+        raise ValueError("Invalid cursor")
+    return created_at, ticket_id
+
+
+def ticket_search_query(search: str):
+    return func.websearch_to_tsquery('english', search)
+
+
+def ticket_filters(search: str | None, status: str | None, search_mode: TicketSearchMode = TicketSearchMode.TITLE) -> list:
+    filters = []
+
     if search:
-        count_stmt = count_stmt.where(Ticket.title.ilike(f"%{search}%"))
-        stmt = stmt.where(Ticket.title.ilike(f"%{search}%"))
-    
+        if search_mode == TicketSearchMode.FULLTEXT:
+            filters.append(Ticket.search_vector.bool_op("@@")(ticket_search_query(search)))
+        else:
+            filters.append(Ticket.title.ilike(f"%{search}%"))
+
     if status:
-        count_stmt = count_stmt.where(Ticket.status == status)
-        stmt = stmt.where(Ticket.status == status)
-    
-    total_result = await db_session.execute(count_stmt)
-    total = total_result.scalar()
-    
-    stmt = stmt.offset(skip).limit(limit)
-    result = await db_session.execute(stmt)
-    tickets = result.scalars().all()
-    
+        filters.append(Ticket.status == status)
+
+    return filters
+
+
+def ticket_search_rank(search: str | None, search_mode: TicketSearchMode):
+    if search and search_mode == TicketSearchMode.FULLTEXT:
+        return func.ts_rank_cd(Ticket.search_vector, ticket_search_query(search))
+    return None
+
+
+def ticket_count_statement(search: str | None, status: str | None, assigned_to_id: int | None = None):
+    # Without a text search the filters map onto ticket_counters, so the total
+    # is a handful of counter rows instead of a scan over tickets. With one,
+    # None makes list_tickets() count the same filters the page uses.
+    if search:
+        return None
+    return ticket_total_statement(status, assigned_to_id)
+
+
+def ticket_rows_statement(*extra_columns):
+    # Plain columns rather than entities, labelled the way
+    # ticket_row_to_response() reads them: rows become response dicts directly,
+    # with no identity map and no from_attributes validation on the way out.
+    return (
+        select(
+            *Ticket.__table__.c[
+                "id", "title", "description", "status", "priority", "client_id",
+                "assigned_to_id", "created_at", "updated_at", "closed_at"
+            ],
+            Client.name.label("client_name"),
+            Client.email.label("client_email"),
+            User.username.label("assignee_username"),
+            User.full_name.label("assignee_full_name"),
+            *extra_columns
+        )
+        .join(Client, Client.id == Ticket.client_id)
+        .outerjoin(User, User.id == Ticket.assigned_to_id)
+    )
+
+
+def ticket_row_to_response(row) -> dict:
     return {
-        "total": total,
-        "tickets": tickets
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        # Enum members go through a slow fallback in to_json(); plain strings do not.
+        "status": row.status.value,
+        "priority": row.priority.value,
+        "client_id": row.client_id,
+        "assigned_to_id": row.assigned_to_id,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "closed_at": row.closed_at,
+        "client": {
+            "id": row.client_id,
+            "name": row.client_name,
+            "email": row.client_email
+        },
+        "assigned_to_user": {
+            "id": row.assigned_to_id,
+            "username": row.assignee_username,
+            "full_name": row.assignee_full_name
+        } if row.assigned_to_id is not None else None
     }
 
 
-async def get_my_tickets(worker_id: int, skip: int, limit: int, search: str | None, status: str | None, db_session: AsyncSession):
-    count_stmt = select(func.count()).select_from(Ticket).where(Ticket.assigned_to_id == worker_id)
-    stmt = select(Ticket).options(
-        selectinload(Ticket.client),
-        selectinload(Ticket.assigned_to_user)
-    ).where(Ticket.assigned_to_id == worker_id)
-    
-    if search:
-        count_stmt = count_stmt.where(Ticket.title.ilike(f"%{search}%"))
-        stmt = stmt.where(Ticket.title.ilike(f"%{search}%"))
-    
-    if status:
-        count_stmt = count_stmt.where(Ticket.status == status)
-        stmt = stmt.where(Ticket.status == status)
-    
-    total_result = await db_session.execute(count_stmt)
-    total = total_result.scalar()
-    
-    stmt = stmt.offset(skip).limit(limit)
+def ticket_summary_rows_statement(*extra_columns):
+    # The dashboard view: no description, no client join, just the assignee's
+    # name. created_at stays in because the cursor is built from it.
+    return (
+        select(
+            *Ticket.__table__.c["id", "title", "status", "priority", "assigned_to_id", "created_at"],
+            func.coalesce(User.full_name, User.username).label("assignee_name"),
+            *extra_columns
+        )
+        .outerjoin(User, User.id == Ticket.assigned_to_id)
+    )
+
+
+def ticket_summary_row_to_response(row) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "status": row.status.value,
+        "priority": row.priority.value,
+        "assigned_to_id": row.assigned_to_id,
+        "assignee_name": row.assignee_name,
+        "created_at": row.created_at
+    }
+
+
+TICKET_LIST_VIEWS = {
+    TicketListView.FULL: (ticket_rows_statement, ticket_row_to_response),
+    TicketListView.SUMMARY: (ticket_summary_rows_statement, ticket_summary_row_to_response),
+}
+
+
+async def list_tickets(
+    filters: list,
+    count_stmt,
+    skip: int,
+    limit: int,
+    cursor: str | None,
+    db_session: AsyncSession,
+    rank=None,
+    view: TicketListView = TicketListView.FULL
+):
+    # A missing count_stmt means the total has to be counted from the matching
+    # tickets. On offset pages count(*) OVER () does that in the page scan
+    # itself; after a cursor the window would only see the remaining rows.
+    if count_stmt is None and not cursor:
+        total_column = func.count().over()
+    else:
+        if count_stmt is None:
+            count_stmt = select(func.count()).select_from(Ticket).where(*filters)
+        total_column = count_stmt.scalar_subquery()
+
+    rows_statement, row_to_response = TICKET_LIST_VIEWS[view]
+    stmt = rows_statement(total_column.label("total")).where(*filters)
+
+    if rank is not None:
+        if cursor:
+            raise ValueError("Cursor pagination is not supported for full-text search, use skip")
+        stmt = stmt.order_by(rank.desc(), Ticket.created_at.desc(), Ticket.id.desc())
+    else:
+        stmt = stmt.order_by(Ticket.created_at.desc(), Ticket.id.desc())
+
+    if cursor:
+        created_at, ticket_id = decode_ticket_cursor(cursor)
+        stmt = stmt.where(tuple_(Ticket.created_at, Ticket.id) < tuple_(created_at, ticket_id))
+    else:
+        stmt = stmt.offset(skip)
+
+    # One extra row tells us whether another page exists without a second query.
+    stmt = stmt.limit(limit + 1)
     result = await db_session.execute(stmt)
-    tickets = result.scalars().all()
-    
+    rows = result.all()
+
+    if rows:
+        total = rows[0].total
+    else:
+        # Past the last page there is no row to carry the total.
+        if count_stmt is None:
+            count_stmt = select(func.count()).select_from(Ticket).where(*filters)
+        total_result = await db_session.execute(count_stmt)
+        total = total_result.scalar()
+
+    next_cursor = None
+    if len(rows) > limit and rank is None:
+        next_cursor = encode_ticket_cursor(rows[limit - 1])
+    tickets = [row_to_response(row) for row in rows[:limit]]
+
     return {
         "total": total,
-        "tickets": tickets
+        "tickets": tickets,
+        "next_cursor": next_cursor
     }
 
 
-async def assign_worker_to_ticket(ticket_id: int, assignment_data, db_session: AsyncSession):
-    stmt = select(Ticket).where(Ticket.id == ticket_id)
+async def get_ticket_list_version(
+    status: str | None,
+    assigned_to_id: int | None,
+    db_session: AsyncSession
+) -> tuple:
+    # Cheap stand-in for "did anything in this listing change", all index or
+    # small-table lookups in one round trip:
+    # - the newest tickets.updated_at (every API write sets it),
+    # - the counters total for the status/assignee filter (inserts, imports
+    #   with historical timestamps, tickets leaving the filter),
+    # - users count and newest updated_at (assignee names in the rows,
+    #   deleted users unassigning tickets through ON DELETE SET NULL).
+    # updated_at comes from the app servers' clocks; a server running behind
+    # the others can make an update invisible here until the next change.
+    stmt = select(
+        select(func.max(Ticket.updated_at)).scalar_subquery(),
+        ticket_total_statement(status, assigned_to_id).scalar_subquery(),
+        select(func.count()).select_from(User).scalar_subquery(),
+        select(func.max(User.updated_at)).scalar_subquery()
+    )
     result = await db_session.execute(stmt)
-    ticket = result.scalar_one_or_none()
+    return tuple(result.one())
+
+
+async def get_all_tickets(
+    skip: int,
+    limit: int,
+    cursor: str | None,
+    search: str | None,
+    search_mode: TicketSearchMode,
+    status: str | None,
+    view: TicketListView,
+    db_session: AsyncSession
+):
+    filters = ticket_filters(search, status, search_mode)
+    count_stmt = ticket_count_statement(search, status)
+    rank = ticket_search_rank(search, search_mode)
+    return await list_tickets(filters, count_stmt, skip, limit, cursor, db_session, rank, view)
+
+
+async def get_my_tickets(
+    worker_id: int,
+    skip: int,
+    limit: int,
+    cursor: str | None,
+    search: str | None,
+    search_mode: TicketSearchMode,
+    status: str | None,
+    view: TicketListView,
+    db_session: AsyncSession
+):
+    filters = [Ticket.assigned_to_id == worker_id, *ticket_filters(search, status, search_mode)]
+    count_stmt = ticket_count_statement(search, status, worker_id)
+    rank = ticket_search_rank(search, search_mode)
+    return await list_tickets(filters, count_stmt, skip, limit, cursor, db_session, rank, view)
+
+
+TICKET_EXPORT_BATCH_SIZE = 1000
+
+TICKET_EXPORT_CSV_COLUMNS = (
+    "id", "title", "description", "status", "priority", "created_at", "updated_at", "closed_at",
+    "client_id", "client_name", "client_email", "assigned_to_id", "assignee_username", "assignee_full_name"
+)
+
+
+def ticket_export_statement(filters: list, rank=None):
+    stmt = ticket_rows_statement().where(*filters)
+
+    if rank is not None:
+        stmt = stmt.order_by(rank.desc(), Ticket.created_at.desc(), Ticket.id.desc())
+    else:
+        stmt = stmt.order_by(Ticket.created_at.desc(), Ticket.id.desc())
+
+    return stmt.execution_options(yield_per=TICKET_EXPORT_BATCH_SIZE)
+
+
+def ticket_export_csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_ticket_export_rows(rows, export_format: TicketFileFormat) -> bytes:
+    if export_format == TicketFileFormat.CSV:
+        return encode_csv(
+            [ticket_export_csv_value(getattr(row, name)) for name in TICKET_EXPORT_CSV_COLUMNS]
+            for row in rows
+        )
+    return b"".join(to_json(ticket_row_to_response(row)) + b"\n" for row in rows)
+
+
+async def export_tickets(
+    search: str | None,
+    search_mode: TicketSearchMode,
+    status: str | None,
+    export_format: TicketFileFormat,
+    session_factory
+):
+    # Runs while the response is being sent, after the request's own session
+    # is gone, so it opens one for itself. session.stream() keeps a server-side
+    # cursor open and pulls TICKET_EXPORT_BATCH_SIZE rows at a time, which keeps
+    # memory flat however many tickets match.
+    stmt = ticket_export_statement(
+        ticket_filters(search, status, search_mode),
+        ticket_search_rank(search, search_mode)
+    )
+
+    if export_format == TicketFileFormat.CSV:
+        yield encode_csv([TICKET_EXPORT_CSV_COLUMNS])
+
+    async with session_factory() as session:
+        result = await session.stream(stmt)
+        async for rows in result.partitions():
+            yield encode_ticket_export_rows(rows, export_format)
+
+
+async def update_tickets(
+    ticket_ids: list[int],
+    values: dict,
+    db_session: AsyncSession,
+    only_assigned_to: int | None = None
+) -> list[dict]:
+    # Locks the target rows, applies the change and returns the joined response
+    # rows together with the pre-update status/assignee in a single statement:
+    #   WITH updated AS (
+    #       UPDATE tickets SET ... FROM (SELECT ... FOR UPDATE) AS locked
+    #       WHERE tickets.id = locked.id RETURNING tickets.*, locked.status, ...)
+    #   SELECT updated.*, clients.name, ..., users.username, ... FROM updated ...
+    target = aliased(Ticket, name="target")
+    locked = (
+        select(target.id, target.status, target.assigned_to_id)
+        .where(target.id.in_(ticket_ids))
+        .order_by(target.id)
+        .with_for_update()
+    )
+    if only_assigned_to is not None:
+        locked = locked.where(target.assigned_to_id == only_assigned_to)
+    locked = locked.subquery("locked")
+
+    updated = (
+        update(Ticket.__table__)
+        .where(Ticket.id == locked.c.id)
+        .values(**values)
+        .returning(
+            *Ticket.__table__.c[
+                "id", "title", "description", "status", "priority", "client_id",
+                "assigned_to_id", "created_at", "updated_at", "closed_at"
+            ],
+            locked.c.status.label("old_status"),
+            locked.c.assigned_to_id.label("old_assigned_to_id")
+        )
+        .cte("updated")
+    )
+
+    stmt = (
+        select(
+            updated,
+            Client.name.label("client_name"),
+            Client.email.label("client_email"),
+            User.username.label("assignee_username"),
+            User.full_name.label("assignee_full_name")
+        )
+        .join(Client, Client.id == updated.c.client_id)
+        .outerjoin(User, User.id == updated.c.assigned_to_id)
+        .order_by(updated.c.id)
+    )
+    result = await db_session.execute(stmt)
+    rows = result.all()
+
+    await record_ticket_changes(db_session, [
+        ((row.old_status, row.old_assigned_to_id), (row.status, row.assigned_to_id))
+        for row in rows
+    ])
+    await notify_ticket_events(db_session, [
+        ticket_changed_event(row, row.old_status, row.old_assigned_to_id) for row in rows
+    ])
+
+    return [ticket_row_to_response(row) for row in rows]
+
+
+async def validate_worker(worker_id: int, db_session: AsyncSession):
+    user = await get_cached_user(worker_id, db_session)
     
-    if ticket is None:
-        raise ValueError("Ticket not found")
+    if user is None:
+        raise ValueError("User not found")
+    
+    if user.role != UserRole.WORKER:
+        raise ValueError("Can only assign workers to tickets")
     
+    return user
+
+
+async def assign_worker_to_ticket(ticket_id: int, assignment_data, db_session: AsyncSession):
     if assignment_data.assigned_to_id is not None:
-        stmt = select(User).where(User.id == assignment_data.assigned_to_id)
-        result = await db_session.execute(stmt)
-        user = result.scalar_one_or_none()
-        
-        if user is None:
-            raise ValueError("User not found")
-        
-        if user.role != UserRole.WORKER:
-            raise ValueError("Can only assign workers to tickets")
-        
-        ticket.assigned_to_id = assignment_data.assigned_to_id
-    else:
-        ticket.assigned_to_id = None
+        await validate_worker(assignment_data.assigned_to_id, db_session)
     
+    values = {"assigned_to_id": assignment_data.assigned_to_id}
     if assignment_data.status is not None:
-        ticket.status = assignment_data.status
+        values["status"] = assignment_data.status
     
-    await db_session.commit()
-    await db_session.refresh(ticket)
+    tickets = await update_tickets([ticket_id], values, db_session)
     
-    stmt = (
-        select(Ticket)
-        .options(
-            selectinload(Ticket.client),
-            selectinload(Ticket.assigned_to_user)
-        )
-        .where(Ticket.id == ticket_id)
-    )
-    result = await db_session.execute(stmt)
-    ticket = result.scalar_one()
+    if not tickets:
+        raise ValueError("Ticket not found")
+    
+    await db_session.commit()
     
-    return ticket
+    return tickets[0]
 
 
 async def unassign_worker_from_ticket(ticket_id: int, db_session: AsyncSession):
-    stmt = select(Ticket).where(Ticket.id == ticket_id)
-    result = await db_session.execute(stmt)
-    ticket = result.scalar_one_or_none()
+    tickets = await update_tickets([ticket_id], {"assigned_to_id": None}, db_session)
     
-    if ticket is None:
+    if not tickets:
         raise ValueError("Ticket not found")
     
-    ticket.assigned_to_id = None
-    
     await db_session.commit()
-    await db_session.refresh(ticket)
     
-    stmt = (
-        select(Ticket)
-        .options(
-            selectinload(Ticket.client),
-            selectinload(Ticket.assigned_to_user)
-        )
-        .where(Ticket.id == ticket_id)
-    )
-    result = await db_session.execute(stmt)
-    ticket = result.scalar_one()
-    
-    return ticket
+    return tickets[0]
 
 
 async def update_ticket_status(ticket_id: int, status_data, current_user, db_session: AsyncSession):
-    stmt = (
-        select(Ticket)
-        .options(
-            selectinload(Ticket.client),
-            selectinload(Ticket.assigned_to_user)
-        )
-        .where(Ticket.id == ticket_id)
-    )
-    result = await db_session.execute(stmt)
-    ticket = result.scalar_one_or_none()
+    only_assigned_to = current_user.id if current_user.role == UserRole.WORKER else None
     
-    if ticket is None:
-        raise ValueError("Ticket not found")
+    tickets = await update_tickets([ticket_id], {"status": status_data.status}, db_session, only_assigned_to)
     
-    if current_user.role == UserRole.WORKER:
-        if ticket.assigned_to_id != current_user.id:
-            raise ValueError("You can only update status of your assigned tickets")
+    if not tickets:
+        # Nothing matched: tell a missing ticket apart from someone else's.
+        stmt = select(Ticket.id).where(Ticket.id == ticket_id)
+        result = await db_session.execute(stmt)
+        if result.scalar_one_or_none() is None:
+            raise ValueError("Ticket not found")
+        raise ValueError("You can only update status of your assigned tickets")
+    
+    await db_session.commit()
+    
+    return tickets[0]
+
+
+def bulk_update_result(ticket_ids: list[int], tickets: list[dict]) -> dict:
+    updated_ids = {ticket["id"] for ticket in tickets}
+    return {
+        "updated": len(tickets),
+        "missing_ids": [ticket_id for ticket_id in ticket_ids if ticket_id not in updated_ids],
+        "tickets": tickets
+    }
+
+
+async def bulk_assign_tickets(assignment_data, db_session: AsyncSession):
+    if assignment_data.assigned_to_id is not None:
+        await validate_worker(assignment_data.assigned_to_id, db_session)
     
-    ticket.status = status_data.status
+    values = {"assigned_to_id": assignment_data.assigned_to_id}
+    if assignment_data.status is not None:
+        values["status"] = assignment_data.status
     
+    ticket_ids = list(dict.fromkeys(assignment_data.ticket_ids))
+    tickets = await update_tickets(ticket_ids, values, db_session)
     await db_session.commit()
-    await db_session.refresh(ticket)
     
-    stmt = (
-        select(Ticket)
-        .options(
-            selectinload(Ticket.client),
-            selectinload(Ticket.assigned_to_user)
-        )
-        .where(Ticket.id == ticket_id)
-    )
-    result = await db_session.execute(stmt)
-    ticket = result.scalar_one()
+    return bulk_update_result(ticket_ids, tickets)
+
+
+async def bulk_update_ticket_status(status_data, db_session: AsyncSession):
+    ticket_ids = list(dict.fromkeys(status_data.ticket_ids))
+    tickets = await update_tickets(ticket_ids, {"status": status_data.status}, db_session)
+    await db_session.commit()
     
-    return ticket
\ No newline at end of file
+    return bulk_update_result(ticket_ids, tickets)
@@ -18,3 +18,28 @@ class TicketPriority(str, Enum):
     MEDIUM = "MEDIUM"
     HIGH = "HIGH"
     URGENT = "URGENT"
+
+
+class TicketSearchMode(str, Enum):
+    TITLE = "TITLE"
+    FULLTEXT = "FULLTEXT"
+
+
+class TicketFileFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class TicketListView(str, Enum):
+    FULL = "full"
+    SUMMARY = "summary"
+
+
+class TicketEventType(str, Enum):
+    CREATED = "ticket_created"
+    ASSIGNED = "ticket_assigned"
+    UNASSIGNED = "ticket_unassigned"
+    STATUS_CHANGED = "ticket_status_changed"
+    IMPORTED = "tickets_imported"
+    # Sent by the server itself: events may have been missed, refetch.
+    RESYNC = "resync"
@@ -0,0 +1,33 @@
+import io
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_async_session
+from src.security import require_admin
+from src.core.enums import TicketFileFormat
+from src.core.imports import services
+from src.core.imports.schemas import TicketImportResponse
+
+
+router = APIRouter(prefix="/imports", tags=["Imports"])
+
+
+@router.post("/tickets", response_model=TicketImportResponse)
+async def import_tickets(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON; GET /tickets/export output is accepted"),
+    file_format: TicketFileFormat | None = Query(None, alias="format", description="ndjson or csv, guessed from the file name when omitted"),
+    db: AsyncSession = Depends(get_async_session),
+    admin_user = Depends(require_admin)
+):
+    try:
+        file_format = file_format or services.guess_file_format(file.filename)
+        # The upload is spooled to a temporary file, which is read in chunks.
+        stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        result = await services.import_tickets(db, stream, file_format)
+        return result
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
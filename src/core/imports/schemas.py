@@ -0,0 +1,54 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+from pydantic.networks import validate_email
+from src.core.enums import TicketStatus, TicketPriority
+
+
+@lru_cache(maxsize=100000)
+def validated_email(value: str) -> str:
+    # Same check as EmailStr, which costs ~0.1 ms per address; history files
+    # repeat the same clients many times, so results are memoized.
+    return validate_email(value)[1]
+
+
+ImportEmail = Annotated[str, Field(max_length=100), AfterValidator(validated_email)]
+
+
+class TicketImportRow(BaseModel):
+    # Extra columns are ignored, so files written by GET /tickets/export can
+    # be imported as they are.
+    model_config = ConfigDict(extra="ignore")
+
+    client_name: str = Field(..., min_length=1, max_length=100)
+    client_email: ImportEmail
+    title: str = Field(..., min_length=1, max_length=200)
+    description: str = Field(..., min_length=1)
+    status: TicketStatus = TicketStatus.NEW
+    priority: TicketPriority = TicketPriority.MEDIUM
+    assignee_username: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    closed_at: datetime | None = None
+
+
+class TicketImportError(BaseModel):
+    line: int
+    message: str
+
+
+class TicketImportResponse(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    clients_created: int
+    errors: list[TicketImportError]
+    errors_truncated: bool
+    # Set when a chunk failed in the database: rows from this line on were not
+    # imported, everything counted in imported was.
+    failed_at_row: int | None = None
+    error: str | None = None
+    elapsed_seconds: float
+    rows_per_second: float
@@ -0,0 +1,304 @@
+import asyncio
+import csv
+import json
+import logging
+import time
+from collections import Counter
+from datetime import UTC, datetime
+from itertools import islice
+from typing import TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import Column, MetaData, String, Table, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.counters import apply_ticket_counter_deltas
+from src.core.enums import TicketEventType, TicketFileFormat
+from src.events import notify_ticket_events
+from src.core.models import Client, User
+from src.core.imports.schemas import TicketImportRow
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 10000
+IMPORT_ERROR_LIMIT = 100
+
+# search_vector is generated by Postgres and must not be part of the COPY.
+IMPORT_TICKET_COLUMNS = [
+    "title", "description", "status", "priority", "client_id",
+    "assigned_to_id", "created_at", "updated_at", "closed_at"
+]
+
+# Per-chunk staging table for client deduplication, dropped on commit.
+import_clients = Table(
+    "import_clients",
+    MetaData(),
+    Column("name", String(100)),
+    Column("email", String(100)),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP"
+)
+
+
+class TicketImportReport:
+    def __init__(self):
+        self.total_rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.clients_created = 0
+        self.errors = []
+        self.failed_at_row = None
+        self.error = None
+        self.started = time.perf_counter()
+
+    def add_error(self, line: int, message: str):
+        # Every failure is counted, only the first few are kept.
+        self.failed += 1
+        if len(self.errors) < IMPORT_ERROR_LIMIT:
+            self.errors.append({"line": line, "message": message})
+
+    def to_response(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "total_rows": self.total_rows,
+            "imported": self.imported,
+            "failed": self.failed,
+            "clients_created": self.clients_created,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "failed_at_row": self.failed_at_row,
+            "error": self.error,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.total_rows / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+def import_error_message(error: Exception) -> str:
+    # Only the database's own message: the statement and its parameters are
+    # not for the caller.
+    if isinstance(error, DBAPIError):
+        error = error.orig.__cause__ or error.orig
+    return f"{type(error).__name__}: {str(error).splitlines()[0] if str(error) else ''}"
+
+
+def guess_file_format(filename: str | None) -> TicketFileFormat:
+    suffix = (filename or "").rsplit(".", 1)[-1].lower()
+    if suffix == "csv":
+        return TicketFileFormat.CSV
+    if suffix in ("ndjson", "jsonl"):
+        return TicketFileFormat.NDJSON
+    raise ValueError("Cannot tell the file format from the file name, pass format=csv or format=ndjson")
+
+
+def read_csv_records(stream: TextIO):
+    reader = csv.DictReader(stream)
+    for record in reader:
+        # Empty cells mean "not set", so optional columns fall back to defaults.
+        yield reader.line_num, {key: value for key, value in record.items() if value not in ("", None)}
+
+
+def read_ndjson_records(stream: TextIO):
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, "Invalid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Expected a JSON object"
+            continue
+
+        # Lines from GET /tickets/export nest the client and assignee.
+        client = record.get("client")
+        if isinstance(client, dict):
+            record.setdefault("client_name", client.get("name"))
+            record.setdefault("client_email", client.get("email"))
+        assignee = record.get("assigned_to_user")
+        if isinstance(assignee, dict):
+            record.setdefault("assignee_username", assignee.get("username"))
+        yield line_number, record
+
+
+def naive_utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(UTC).replace(tzinfo=None)
+    return value
+
+
+def parse_import_rows(stream: TextIO, file_format: TicketFileFormat):
+    # Yields (line, TicketImportRow) or (line, error message) per input row.
+    records = read_csv_records(stream) if file_format == TicketFileFormat.CSV else read_ndjson_records(stream)
+    for line, record in records:
+        if isinstance(record, str):
+            yield line, record
+            continue
+        try:
+            row = TicketImportRow.model_validate(record)
+        except ValidationError as e:
+            yield line, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                for error in e.errors()
+            )
+            continue
+        row.created_at = naive_utc(row.created_at)
+        row.updated_at = naive_utc(row.updated_at)
+        row.closed_at = naive_utc(row.closed_at)
+        yield line, row
+
+
+async def import_ticket_chunk(
+    session: AsyncSession,
+    rows: list[tuple[int, TicketImportRow]],
+    user_ids: dict[str, int],
+    report: TicketImportReport
+):
+    tickets = []
+    for line, row in rows:
+        assigned_to_id = None
+        if row.assignee_username is not None:
+            assigned_to_id = user_ids.get(row.assignee_username)
+            if assigned_to_id is None:
+                report.add_error(line, f"assignee_username: unknown user {row.assignee_username!r}")
+                continue
+        tickets.append((row, assigned_to_id))
+
+    if not tickets:
+        return
+
+    # COPY goes through the session's own asyncpg connection, so the staging
+    # table, the client upsert, the tickets and the counters share one
+    # transaction per chunk.
+    connection = await session.connection()
+    await connection.run_sync(import_clients.create)
+    driver_connection = (await connection.get_raw_connection()).driver_connection
+
+    # Existing clients keep their current name; new ones take the last name
+    # seen in the chunk.
+    names_by_email = {row.client_email: row.client_name for row, _ in tickets}
+    await driver_connection.copy_records_to_table(
+        "import_clients",
+        records=[(name, email) for email, name in names_by_email.items()],
+        columns=["name", "email"]
+    )
+    result = await session.execute(
+        pg_insert(Client)
+        .from_select(["name", "email"], select(import_clients.c.name, import_clients.c.email))
+        .on_conflict_do_nothing(index_elements=[Client.email])
+    )
+    clients_created = result.rowcount
+
+    result = await session.execute(
+        select(Client.email, Client.id).join(import_clients, import_clients.c.email == Client.email)
+    )
+    client_ids = dict(result.all())
+
+    now = datetime.utcnow()
+    records = []
+    deltas = Counter()
+    for row, assigned_to_id in tickets:
+        created_at = row.created_at or now
+        records.append((
+            row.title,
+            row.description,
+            row.status.value,
+            row.priority.value,
+            client_ids[row.client_email],
+            assigned_to_id,
+            created_at,
+            row.updated_at or row.closed_at or created_at,
+            row.closed_at,
+        ))
+        deltas[(row.status, assigned_to_id)] += 1
+
+    await driver_connection.copy_records_to_table("tickets", records=records, columns=IMPORT_TICKET_COLUMNS)
+    await apply_ticket_counter_deltas(session, deltas)
+    # History is announced per chunk, not per ticket.
+    await notify_ticket_events(session, [{"event": TicketEventType.IMPORTED.value, "count": len(records)}])
+    await session.commit()
+
+    report.imported += len(records)
+    report.clients_created += clients_created
+
+
+async def import_tickets(
+    session: AsyncSession,
+    stream: TextIO,
+    file_format: TicketFileFormat,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    progress=None
+) -> dict:
+    # The file is parsed and validated in a worker thread one chunk at a time,
+    # so memory depends on chunk_size rather than on the file size. Each chunk
+    # is committed on its own; a chunk that fails in the database, or a file
+    # that cannot be read any further (bad UTF-8, broken CSV quoting), stops
+    # the import with the earlier rows kept, and the report says where:
+    # failed_at_row is the first line not imported, nothing from there on was.
+    report = TicketImportReport()
+    result = await session.execute(select(User.username, User.id))
+    user_ids = dict(result.all())
+    await session.commit()
+
+    rows = parse_import_rows(stream, file_format)
+    last_line = 0
+
+    def read_chunk():
+        # Returns the rows read and the error that stopped reading, if any;
+        # the rows before it are still imported.
+        nonlocal last_line
+        chunk = []
+        try:
+            for line, row in islice(rows, chunk_size):
+                chunk.append((line, row))
+                last_line = line
+        except (UnicodeDecodeError, csv.Error) as e:
+            return chunk, e
+        return chunk, None
+
+    # The next chunk is parsed while the current one is being written.
+    next_chunk = asyncio.ensure_future(asyncio.to_thread(read_chunk))
+    try:
+        while True:
+            parsed, read_error = await next_chunk
+            if read_error is None:
+                if not parsed:
+                    break
+                next_chunk = asyncio.ensure_future(asyncio.to_thread(read_chunk))
+            report.total_rows += len(parsed)
+            valid = []
+            for line, row in parsed:
+                if isinstance(row, str):
+                    report.add_error(line, row)
+                else:
+                    valid.append((line, row))
+
+            try:
+                await import_ticket_chunk(session, valid, user_ids, report)
+            except Exception as e:
+                logger.exception("Ticket import failed in the chunk starting at line %s", parsed[0][0])
+                await session.rollback()
+                report.failed_at_row = parsed[0][0]
+                report.error = import_error_message(e)
+                break
+
+            logger.info(
+                "Ticket import: %s rows read, %s imported, %s failed",
+                report.total_rows, report.imported, report.failed
+            )
+            if progress is not None:
+                progress(report)
+
+            if read_error is not None:
+                logger.warning("Ticket import stopped, file unreadable after line %s: %s", last_line, read_error)
+                report.failed_at_row = last_line + 1
+                report.error = import_error_message(read_error)
+                break
+    finally:
+        # A parser thread cannot be interrupted; let it finish before the
+        # caller closes the file under it.
+        await asyncio.gather(next_chunk, return_exceptions=True)
+
+    return report.to_response()
@@ -1,5 +1,6 @@
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Enum as SQLEnum, Text
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Enum as SQLEnum, Text, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.database import Base
 from src.core.enums import UserRole, TicketStatus, TicketPriority
@@ -47,5 +48,38 @@ class Ticket(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     closed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', description), 'B')",
+            persisted=True
+        ),
+        deferred=True
+    )
+
     client: Mapped["Client"] = relationship("Client", back_populates="tickets")
     assigned_to_user: Mapped["User"] = relationship("User", back_populates="assigned_tickets", foreign_keys=[assigned_to_id])
+
+    __table_args__ = (
+        Index("ix_tickets_created_at_id", "created_at", "id"),
+        Index("ix_tickets_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tickets_assigned_to_id_created_at_id", "assigned_to_id", "created_at", "id"),
+        Index("ix_tickets_assigned_to_id_status_created_at_id", "assigned_to_id", "status", "created_at", "id"),
+        Index("ix_tickets_client_id", "client_id"),
+        Index("ix_tickets_updated_at", "updated_at"),
+        Index("ix_tickets_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_tickets_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+    )
+
+
+class TicketCounter(Base):
+    __tablename__ = "ticket_counters"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    status: Mapped[TicketStatus] = mapped_column(SQLEnum(TicketStatus), nullable=False)
+    assigned_to_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_ticket_counters_status_assigned_to_id", "status", "assigned_to_id", unique=True, postgresql_nulls_not_distinct=True),
+    )
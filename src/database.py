@@ -1,18 +1,198 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from src.sql_stats import instrument_engine
 
-from config import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER
+from config import (
+    DB_HOST,
+    DB_NAME,
+    DB_PASS,
+    DB_PORT,
+    DB_USER,
+    DB_ECHO,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_REPLICA_HOST,
+    DB_REPLICA_PORT,
+    DB_REPLICA_MAX_LAG_SECONDS,
+    DB_REPLICA_CHECK_INTERVAL,
+    DB_REPLICA_CHECK_TIMEOUT,
+)
 
 DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+REPLICA_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_REPLICA_HOST}:{DB_REPLICA_PORT}/{DB_NAME}"
 Base = declarative_base()
 
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+class PoolWaitStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, wait_seconds: float, timed_out: bool):
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+
+def instrumented_pool_class(wait_stats: PoolWaitStats):
+    # Pool.recreate() (e.g. on engine.dispose()) builds a new instance of the
+    # same class, so the stats live on the class rather than the instance.
+    class InstrumentedPool(AsyncAdaptedQueuePool):
+        stats = wait_stats
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except Exception:
+                self.stats.record(time.perf_counter() - start, timed_out=True)
+                raise
+            self.stats.record(time.perf_counter() - start, timed_out=False)
+            return connection
+
+    return InstrumentedPool
+
+
+def create_engine_from_config(url: str, name: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        echo=DB_ECHO,
+        poolclass=instrumented_pool_class(PoolWaitStats()),
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        pool_logging_name=name,
+        connect_args={
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+    instrument_engine(engine)
+    return engine
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    stats = pool.stats
+    return {
+        "size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": stats.checkouts,
+        "checkout_timeouts": stats.timeouts,
+        "checkout_wait_seconds_total": stats.wait_seconds_total,
+        "checkout_wait_seconds_max": stats.wait_seconds_max,
+    }
+
+
+# Seconds the replica is behind the primary; 0 when it has replayed
+# everything it received or when it is not a standby at all.
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaHealth:
+    """Replica reachability and lag, refreshed by the replica_health periodic
+    job (src/tasks.py) so requests only read the last result."""
+
+    def __init__(self, engine: AsyncEngine, max_lag: float, check_interval: float, check_timeout: float):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.healthy = False
+        self.lag_seconds = None
+        self.checked_at = None
+
+    async def check(self):
+        try:
+            async with asyncio.timeout(self.check_timeout):
+                async with self.engine.connect() as conn:
+                    result = await conn.execute(REPLICA_LAG_SQL)
+                    self.lag_seconds = float(result.scalar())
+            self.healthy = self.lag_seconds <= self.max_lag
+        except Exception:
+            self.lag_seconds = None
+            self.healthy = False
+        self.checked_at = time.monotonic()
+
+    def is_usable(self) -> bool:
+        # A result that has not been refreshed for two intervals (the job runner
+        # is stopped or backed up) no longer says anything about the lag.
+        if self.checked_at is None or time.monotonic() - self.checked_at > 2 * self.check_interval + self.check_timeout:
+            return False
+        return self.healthy
+
+
+engine = create_engine_from_config(DATABASE_URL, "primary")
 
 async_sessionmaker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# For connections held for the life of the process: the auto-assign leader
+# lock and the ticket event LISTEN. NullPool opens each one on demand and
+# really closes it, so they never take a slot of the request pool; count them
+# on top of DB_POOL_SIZE + DB_MAX_OVERFLOW when sizing max_connections.
+dedicated_engine = create_async_engine(
+    DATABASE_URL,
+    echo=DB_ECHO,
+    poolclass=NullPool,
+    connect_args={
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+    },
+)
+
+replica_engine = create_engine_from_config(REPLICA_DATABASE_URL, "replica") if DB_REPLICA_HOST else None
+
+replica_sessionmaker = (
+    sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False) if replica_engine else None
+)
+
+replica_health = (
+    ReplicaHealth(replica_engine, DB_REPLICA_MAX_LAG_SECONDS, DB_REPLICA_CHECK_INTERVAL, DB_REPLICA_CHECK_TIMEOUT)
+    if replica_engine else None
+)
+
 
 async def get_async_session() -> AsyncSession:
     async with async_sessionmaker() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+def read_sessionmaker():
+    # Read-only work goes to the replica while it is reachable and within
+    # DB_REPLICA_MAX_LAG_SECONDS of the primary, otherwise to the primary.
+    if replica_health is not None and replica_health.is_usable():
+        return replica_sessionmaker
+    return async_sessionmaker
+
+
+async def get_read_session() -> AsyncSession:
+    session_factory = read_sessionmaker()
+    async with session_factory() as session:
+        yield session
@@ -0,0 +1,38 @@
+import hashlib
+
+from fastapi import Request
+from fastapi.responses import Response
+
+# Clients and proxies may keep the body but must revalidate before using it.
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    # Weak: the tag follows a version signal of the data, not the exact bytes
+    # of the body.
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def request_etag(request: Request, *version) -> str:
+    # The same data read through a different page, filter or view is a
+    # different representation.
+    return make_etag(request.url.path, sorted(request.query_params.multi_items()), *version)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
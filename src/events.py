@@ -0,0 +1,298 @@
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+
+from pydantic_core import to_json
+from sqlalchemy import ARRAY, Text, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from config import (
+    EVENTS_SUBSCRIBER_QUEUE_SIZE,
+    EVENTS_MAX_SUBSCRIBERS,
+    EVENTS_HEARTBEAT_SECONDS,
+    EVENTS_RECONNECT_SECONDS,
+)
+from src.database import dedicated_engine
+from src.core.enums import TicketEventType, UserRole
+
+logger = logging.getLogger(__name__)
+
+TICKET_EVENTS_CHANNEL = "ticket_events"
+
+# One statement for any number of events. NOTIFY is transactional: Postgres
+# delivers the payloads on commit and drops them on rollback.
+NOTIFY_STATEMENT = text(
+    "SELECT pg_notify(:channel, payload) FROM unnest(:payloads) AS payload"
+).bindparams(bindparam("payloads", type_=ARRAY(Text)))
+
+
+def ticket_created_event(row) -> dict:
+    return {
+        "event": TicketEventType.CREATED.value,
+        "ticket_id": row.id,
+        "title": row.title,
+        "status": row.status.value,
+        "assigned_to_id": None,
+        "at": row.created_at,
+    }
+
+
+def ticket_changed_event(row, previous_status, previous_assigned_to_id) -> dict | None:
+    if row.assigned_to_id != previous_assigned_to_id:
+        event_type = TicketEventType.ASSIGNED if row.assigned_to_id is not None else TicketEventType.UNASSIGNED
+    elif row.status != previous_status:
+        event_type = TicketEventType.STATUS_CHANGED
+    else:
+        return None
+
+    event = {
+        "event": event_type.value,
+        "ticket_id": row.id,
+        "title": row.title,
+        "status": row.status.value,
+        "previous_status": previous_status.value,
+        "assigned_to_id": row.assigned_to_id,
+        "at": row.updated_at,
+    }
+    if previous_assigned_to_id != row.assigned_to_id:
+        # The worker losing the ticket is told too.
+        event["previous_assigned_to_id"] = previous_assigned_to_id
+    return event
+
+
+async def notify_ticket_events(
+    db_session: AsyncSession,
+    events: list[dict | None],
+    channel: str = TICKET_EVENTS_CHANNEL
+):
+    payloads = [to_json(event).decode("utf-8") for event in events if event is not None]
+    if payloads:
+        await db_session.execute(NOTIFY_STATEMENT, {"channel": channel, "payloads": payloads})
+
+
+def sse_frame(event_type: str, data: str) -> bytes:
+    return f"event: {event_type}\ndata: {data}\n\n".encode("utf-8")
+
+
+HEARTBEAT_FRAME = b": ping\n\n"
+
+
+class TooManySubscribers(Exception):
+    pass
+
+
+class EventSubscriber:
+    def __init__(self, user_id: int, is_admin: bool, queue_size: int):
+        self.user_id = user_id
+        self.is_admin = is_admin
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.closing_frame = None
+
+    def send(self, frame: bytes) -> bool:
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def close(self, closing_frame: bytes | None = None):
+        # Whatever is still buffered is dropped; the stream sends closing_frame
+        # (if any) and ends.
+        self.closing_frame = closing_frame
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class TicketEventBroker:
+    """Fans ticket events out from one LISTEN connection per process to every
+    open /tickets/events stream.
+
+    Admins get every event; workers get the events of tickets assigned to
+    them, or just taken away from them. Each subscriber has a bounded queue;
+    one that falls behind is disconnected with a resync event instead of
+    holding memory or slowing down the others. Events sent while the listener
+    is reconnecting are lost, so subscribers get a resync event afterwards.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        queue_size: int,
+        max_subscribers: int,
+        heartbeat_interval: float,
+        reconnect_interval: float,
+        channel: str = TICKET_EVENTS_CHANNEL
+    ):
+        self.engine = engine
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.heartbeat_interval = heartbeat_interval
+        self.reconnect_interval = reconnect_interval
+        self.channel = channel
+        self.admins = set()
+        self.workers = defaultdict(set)
+        self.subscriber_count = 0
+        self.task = None
+        self.connected = False
+        self.received = 0
+        self.delivered = 0
+        self.dropped_subscribers = 0
+        self.reconnects = 0
+
+    def subscribe(self, user) -> EventSubscriber:
+        if self.subscriber_count >= self.max_subscribers:
+            raise TooManySubscribers("Too many open event streams, try again later")
+
+        subscriber = EventSubscriber(user.id, user.role == UserRole.ADMIN, self.queue_size)
+        if subscriber.is_admin:
+            self.admins.add(subscriber)
+        else:
+            self.workers[subscriber.user_id].add(subscriber)
+        self.subscriber_count += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: EventSubscriber):
+        if subscriber.is_admin:
+            subscribers = self.admins
+        else:
+            subscribers = self.workers.get(subscriber.user_id)
+        if subscribers is None or subscriber not in subscribers:
+            return
+
+        subscribers.discard(subscriber)
+        if not subscribers and not subscriber.is_admin:
+            del self.workers[subscriber.user_id]
+        self.subscriber_count -= 1
+
+    def deliver(self, subscriber: EventSubscriber, frame: bytes):
+        if subscriber.send(frame):
+            self.delivered += 1
+            return
+        self.dropped_subscribers += 1
+        self.unsubscribe(subscriber)
+        subscriber.close(sse_frame(TicketEventType.RESYNC.value, '{"reason": "slow_consumer"}'))
+
+    def broadcast(self, frame: bytes):
+        for subscriber in [*self.admins, *(s for group in self.workers.values() for s in group)]:
+            self.deliver(subscriber, frame)
+
+    def dispatch(self, connection, pid: int, channel: str, payload: str):
+        # Called by asyncpg for every NOTIFY. The payload is parsed once for
+        # routing and forwarded as is; every subscriber gets the same bytes.
+        self.received += 1
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed ticket event: %.200s", payload)
+            return
+
+        frame = sse_frame(event.get("event", "message"), payload)
+        targets = list(self.admins)
+        for key in ("assigned_to_id", "previous_assigned_to_id"):
+            worker_id = event.get(key)
+            if worker_id is not None:
+                targets.extend(self.workers.get(worker_id, ()))
+        for subscriber in targets:
+            self.deliver(subscriber, frame)
+
+    async def listen(self):
+        first_connection = True
+        while True:
+            connection = None
+            try:
+                # Held for the life of the process, like the auto-assign lock,
+                # so it comes from dedicated_engine rather than the request
+                # pool; LISTEN needs no transaction.
+                connection = await self.engine.connect()
+                raw_connection = await connection.get_raw_connection()
+                driver_connection = raw_connection.driver_connection
+                await driver_connection.add_listener(self.channel, self.dispatch)
+                self.connected = True
+                if not first_connection:
+                    self.reconnects += 1
+                    self.broadcast(sse_frame(TicketEventType.RESYNC.value, '{"reason": "reconnected"}'))
+                first_connection = False
+
+                # A notification-only connection never notices a dead server
+                # on its own, so it is pinged.
+                while True:
+                    await asyncio.sleep(self.heartbeat_interval)
+                    await driver_connection.execute("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Ticket event listener lost its connection, reconnecting", exc_info=True)
+            finally:
+                self.connected = False
+                if connection is not None:
+                    # Never let a LISTENing connection be reused.
+                    try:
+                        await connection.invalidate()
+                    except Exception:
+                        pass
+            await asyncio.sleep(self.reconnect_interval)
+
+    async def start(self):
+        self.task = asyncio.create_task(self.listen())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        for subscriber in [*self.admins, *(s for group in self.workers.values() for s in group)]:
+            subscriber.close()
+        self.admins.clear()
+        self.workers.clear()
+        self.subscriber_count = 0
+
+    async def stream(self, subscriber: EventSubscriber, expires_at: float | None = None):
+        # The stream ends when the access token expires; the client reconnects
+        # with a fresh one.
+        try:
+            yield HEARTBEAT_FRAME
+            while True:
+                timeout = self.heartbeat_interval
+                if expires_at is not None:
+                    remaining = expires_at - time.time()
+                    if remaining <= 0:
+                        yield sse_frame("expired", "{}")
+                        return
+                    timeout = min(timeout, remaining)
+
+                try:
+                    async with asyncio.timeout(timeout):
+                        frame = await subscriber.queue.get()
+                except TimeoutError:
+                    yield HEARTBEAT_FRAME
+                    continue
+
+                if frame is None:
+                    if subscriber.closing_frame is not None:
+                        yield subscriber.closing_frame
+                    return
+                yield frame
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "subscribers": self.subscriber_count,
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped_subscribers": self.dropped_subscribers,
+            "reconnects": self.reconnects,
+        }
+
+
+ticket_event_broker = TicketEventBroker(
+    dedicated_engine,
+    queue_size=EVENTS_SUBSCRIBER_QUEUE_SIZE,
+    max_subscribers=EVENTS_MAX_SUBSCRIBERS,
+    heartbeat_interval=EVENTS_HEARTBEAT_SECONDS,
+    reconnect_interval=EVENTS_RECONNECT_SECONDS,
+)
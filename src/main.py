@@ -1,11 +1,45 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from src.core.client.routers import router as client_router
 from src.core.auth.routers import router as auth_router
 from src.core.crm.routers import user_managment_router, ticket_router
+from src.core.imports.routers import router as imports_router
+from src.metrics import MetricsMiddleware, router as metrics_router
+from src.sql_stats import SQLStatsMiddleware
+from src.events import ticket_event_broker
+from src.passwords import PasswordHasherBusy, password_hasher
+from src.tasks import auto_assigner, job_runner
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await job_runner.start()
+    await ticket_event_broker.start()
+    yield
+    await ticket_event_broker.stop()
+    await job_runner.stop()
+    await auto_assigner.release_leadership()
+    password_hasher.shutdown()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(SQLStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth_router)
 app.include_router(client_router)
 app.include_router(ticket_router)
-app.include_router(user_managment_router)
\ No newline at end of file
+app.include_router(user_managment_router)
+app.include_router(imports_router)
+app.include_router(metrics_router)
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"}
+    )
@@ -0,0 +1,279 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.routing import Match
+
+from src.cache import cache_stats
+from src.database import engine, pool_status, replica_engine, replica_health
+from src.events import ticket_event_broker
+from src.passwords import password_hasher
+from src.sql_stats import UNMATCHED_ROUTE, sql_metrics
+from src.tasks import auto_assigner, job_runner
+
+# Upper bounds (seconds) of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Streamed responses (event feeds, exports) stay open for minutes, which would
+# swamp the request latency buckets; they get their own histogram.
+STREAM_BUCKETS = (1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        # One slot per bucket plus +Inf; cumulated only when rendered.
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+class HTTPMetrics:
+    def __init__(self):
+        self.in_flight = defaultdict(int)
+        self.requests = defaultdict(int)
+        self.latency = defaultdict(LatencyHistogram)
+        self.stream_duration = defaultdict(lambda: LatencyHistogram(STREAM_BUCKETS))
+
+    def record(self, method: str, route: str, status_code: int, seconds: float, streamed: bool):
+        self.requests[(method, route, status_code)] += 1
+        if streamed:
+            self.stream_duration[(method, route)].observe(seconds)
+        else:
+            self.latency[(method, route)].observe(seconds)
+
+
+http_metrics = HTTPMetrics()
+
+
+def match_route_label(scope) -> str:
+    # The router only sets scope["route"] once it dispatches, so the in-flight
+    # gauge matches the route itself: the same template route_label() gives.
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses pass through untouched and
+    the per-request cost is a route match and a few dict updates."""
+
+    def __init__(self, app, metrics: HTTPMetrics = http_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        key = (scope["method"], match_route_label(scope))
+        status_code = 500
+        streamed = None
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code, streamed
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body" and streamed is None:
+                # Plain responses send their body in one message.
+                streamed = message.get("more_body", False)
+            await send(message)
+
+        metrics.in_flight[key] += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_flight[key] -= 1
+            metrics.record(*key, status_code, time.perf_counter() - start, bool(streamed))
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+class MetricsWriter:
+    def __init__(self):
+        self.lines = []
+
+    def metric(self, name: str, metric_type: str, help_text: str, samples: list[tuple[dict, float]]):
+        if metric_type == "counter" and not name.endswith("_total"):
+            name = f"{name}_total"
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            self.lines.append(f"{name}{format_labels(labels)} {value}")
+
+    def histogram(self, name: str, help_text: str, samples: list[tuple[dict, LatencyHistogram]]):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} histogram")
+        for labels, histogram in samples:
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                cumulative += count
+                self.lines.append(f"{name}_bucket{format_labels({**labels, 'le': bound})} {cumulative}")
+            self.lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum}")
+            self.lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def write_http_metrics(writer: MetricsWriter, metrics: HTTPMetrics):
+    writer.metric("http_requests_in_flight", "gauge", "Requests currently being handled, by route.", [
+        ({"method": method, "route": route}, count)
+        for (method, route), count in sorted(metrics.in_flight.items())
+    ])
+    writer.metric("http_requests_total", "counter", "Handled requests by route and status code.", [
+        ({"method": method, "route": route, "status": status_code}, count)
+        for (method, route, status_code), count in sorted(metrics.requests.items())
+    ])
+    writer.histogram("http_request_duration_seconds", "Request latency by route, including the response body; streamed responses excluded.", [
+        ({"method": method, "route": route}, histogram)
+        for (method, route), histogram in sorted(metrics.latency.items())
+    ])
+    writer.histogram("http_stream_duration_seconds", "How long streamed responses (event feeds, exports) stayed open, by route.", [
+        ({"method": method, "route": route}, histogram)
+        for (method, route), histogram in sorted(metrics.stream_duration.items())
+    ])
+
+
+def write_sql_metrics(writer: MetricsWriter):
+    routes = sorted(sql_metrics.routes.items())
+    writer.metric("db_queries", "counter", "SQL statements run by requests, by route.", [
+        ({"method": method, "route": route}, metrics.queries) for (method, route), metrics in routes
+    ])
+    writer.metric("db_query_seconds_total", "counter", "Time requests spent in SQL statements, by route.", [
+        ({"method": method, "route": route}, metrics.seconds) for (method, route), metrics in routes
+    ])
+    writer.metric("db_n_plus_one_requests", "counter", "Requests that repeated one statement SQL_N_PLUS_ONE_THRESHOLD times.", [
+        ({"method": method, "route": route}, metrics.n_plus_one) for (method, route), metrics in routes
+    ])
+    writer.metric("db_slow_queries", "counter", "Statements slower than SQL_SLOW_QUERY_MS (logged or not).", [
+        ({}, sql_metrics.slow_queries)
+    ])
+
+
+def write_pool_metrics(writer: MetricsWriter):
+    pools = [("primary", pool_status(engine))]
+    if replica_engine is not None:
+        pools.append(("replica", pool_status(replica_engine)))
+
+    for key, metric_type, help_text in (
+        ("size", "gauge", "Configured persistent connections."),
+        ("in_use", "gauge", "Connections checked out."),
+        ("idle", "gauge", "Connections idle in the pool."),
+        ("overflow", "gauge", "Connections open above the pool size."),
+        ("checkouts", "counter", "Successful connection checkouts."),
+        ("checkout_timeouts", "counter", "Checkouts that timed out waiting for a connection."),
+        ("checkout_wait_seconds_total", "counter", "Time spent waiting for connections."),
+        ("checkout_wait_seconds_max", "gauge", "Longest wait for a connection."),
+    ):
+        writer.metric(f"db_pool_{key}", metric_type, help_text, [({"pool": pool}, status[key]) for pool, status in pools])
+
+    if replica_health is not None:
+        writer.metric("db_replica_healthy", "gauge", "1 while reads may use the replica.", [
+            ({}, int(replica_health.is_usable()))
+        ])
+        writer.metric("db_replica_lag_seconds", "gauge", "Replica replay lag at the last check.", [
+            ({}, replica_health.lag_seconds if replica_health.lag_seconds is not None else "NaN")
+        ])
+
+
+def write_cache_metrics(writer: MetricsWriter):
+    caches = cache_stats()
+    for key, metric_type, help_text in (
+        ("size", "gauge", "Cached entries."),
+        ("hits", "counter", "Cache hits."),
+        ("misses", "counter", "Cache misses."),
+        ("evictions", "counter", "Entries evicted to stay within CACHE_MAX_ENTRIES."),
+    ):
+        writer.metric(f"cache_{key}", metric_type, help_text, [
+            ({"cache": cache}, stats[key]) for cache, stats in caches.items()
+        ])
+
+
+def write_task_metrics(writer: MetricsWriter):
+    hasher = password_hasher.stats()
+    writer.metric("password_hasher_workers", "gauge", "Threads hashing passwords.", [({}, hasher["workers"])])
+    writer.metric("password_hasher_pending", "gauge", "Password operations running or waiting.", [({}, hasher["pending"])])
+    writer.metric("password_hasher_rejected", "counter", "Password operations refused with 503.", [({}, hasher["rejected"])])
+
+    jobs = job_runner.stats()
+    writer.metric("job_queue_depth", "gauge", "Background jobs waiting to run.", [({}, jobs["queue_depth"])])
+    writer.metric("job_queue_size", "gauge", "Background job queue capacity.", [({}, jobs["queue_size"])])
+    writer.metric("jobs_running", "gauge", "Background jobs running.", [({}, jobs["running"])])
+    writer.metric("jobs_submitted", "counter", "Background jobs accepted.", [({}, jobs["submitted"])])
+    writer.metric("jobs_rejected", "counter", "Background jobs dropped (queue full, duplicate or stopped).", [
+        ({}, jobs["rejected"])
+    ])
+    job_stats = sorted(jobs["jobs"].items())
+    writer.metric("job_runs", "counter", "Finished background jobs.", [({"job": name}, stats["runs"]) for name, stats in job_stats])
+    writer.metric("job_failures", "counter", "Failed background jobs.", [({"job": name}, stats["failures"]) for name, stats in job_stats])
+    writer.metric("job_duration_seconds_total", "counter", "Time spent running background jobs.", [
+        ({"job": name}, stats["duration_seconds_total"]) for name, stats in job_stats
+    ])
+    writer.metric("job_duration_seconds_max", "gauge", "Longest background job run.", [
+        ({"job": name}, stats["duration_seconds_max"]) for name, stats in job_stats
+    ])
+
+    assigner = auto_assigner.stats()
+    writer.metric("auto_assign_leader", "gauge", "1 in the process holding the assignment lock.", [
+        ({}, int(assigner["leader"]))
+    ])
+    writer.metric("auto_assign_assigned", "counter", "Tickets assigned automatically by this process.", [
+        ({}, assigner["assigned_total"])
+    ])
+
+
+def write_event_metrics(writer: MetricsWriter):
+    events = ticket_event_broker.stats()
+    writer.metric("ticket_events_listener_connected", "gauge", "1 while the LISTEN connection is up.", [
+        ({}, int(events["connected"]))
+    ])
+    writer.metric("ticket_events_subscribers", "gauge", "Open /tickets/events streams.", [({}, events["subscribers"])])
+    writer.metric("ticket_events_received", "counter", "Notifications received from Postgres.", [({}, events["received"])])
+    writer.metric("ticket_events_delivered", "counter", "Events queued to subscribers.", [({}, events["delivered"])])
+    writer.metric("ticket_events_dropped_subscribers", "counter", "Streams closed for falling behind.", [
+        ({}, events["dropped_subscribers"])
+    ])
+    writer.metric("ticket_events_reconnects", "counter", "Times the LISTEN connection was re-opened.", [
+        ({}, events["reconnects"])
+    ])
+
+
+def render_metrics() -> str:
+    writer = MetricsWriter()
+    write_http_metrics(writer, http_metrics)
+    write_sql_metrics(writer)
+    write_pool_metrics(writer)
+    write_cache_metrics(writer)
+    write_task_metrics(writer)
+    write_event_metrics(writer)
+    return writer.render()
+
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    # Counters are per process; with several uvicorn workers each one is a
+    # separate scrape target (or use one worker per container).
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,69 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from config import PASSWORD_HASH_QUEUE_LIMIT, PASSWORD_HASH_WORKERS
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+def hash_password_sync(password: str) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+
+def verify_password_sync(password: str, password_hash: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+class PasswordHasher:
+    # bcrypt releases the GIL, so a thread pool keeps hashing off the event
+    # loop. Calls beyond workers + queue_limit are rejected instead of piling
+    # up behind a login burst.
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.pending = 0
+        self.rejected = 0
+
+    async def run(self, func, *args):
+        if self.pending >= self.workers + self.queue_limit:
+            self.rejected += 1
+            raise PasswordHasherBusy("Too many password operations in progress, retry shortly")
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password_sync, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self.run(verify_password_sync, password, password_hash)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "pending": self.pending,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    return await password_hasher.verify(password, password_hash)
@@ -0,0 +1,177 @@
+import logging
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config import (
+    SQL_STATS_HEADERS,
+    SQL_SLOW_QUERY_MS,
+    SQL_SLOW_QUERY_SAMPLE_RATE,
+    SQL_N_PLUS_ONE_THRESHOLD,
+)
+
+logger = logging.getLogger(__name__)
+
+# Statements kept per request for the X-DB-Slowest header.
+SLOWEST_STATEMENTS = 3
+
+WHITESPACE = re.compile(r"\s+")
+
+# Label for requests that matched no route, so unknown paths (scanners, typos)
+# cannot grow the label set without bound.
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_label(scope) -> str:
+    # The router stores the matched route in the scope; its path is the
+    # template (/tickets/{ticket_id}/assign), not the concrete URL.
+    route = scope.get("route")
+    return route.path if route is not None else UNMATCHED_ROUTE
+
+
+def statement_summary(statement: str, length: int = 120) -> str:
+    summary = WHITESPACE.sub(" ", statement).strip()
+    return summary if len(summary) <= length else summary[:length - 3] + "..."
+
+
+class RequestSQLStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest = []
+        self.shapes = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        # SQLAlchemy emits the same SQL text for the same query with different
+        # parameters, so the text itself is the statement's shape.
+        self.shapes[statement] += 1
+        if len(self.slowest) < SLOWEST_STATEMENTS or seconds > self.slowest[-1][0]:
+            self.slowest.append((seconds, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[SLOWEST_STATEMENTS:]
+
+    def repeated_statements(self) -> list[tuple[str, int]]:
+        if SQL_N_PLUS_ONE_THRESHOLD <= 0:
+            return []
+        return [(statement, count) for statement, count in self.shapes.items() if count >= SQL_N_PLUS_ONE_THRESHOLD]
+
+
+# Stats of the request being handled. Engine events run inside SQLAlchemy's
+# greenlet, which shares the calling task's context, so they see this value.
+request_sql_stats: ContextVar[RequestSQLStats | None] = ContextVar("request_sql_stats", default=None)
+
+
+class RouteSQLMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.n_plus_one = 0
+
+
+class SQLMetrics:
+    def __init__(self):
+        self.routes = defaultdict(RouteSQLMetrics)
+        self.slow_queries = 0
+
+    def record(self, method: str, route: str, stats: RequestSQLStats, n_plus_one: bool):
+        metrics = self.routes[(method, route)]
+        metrics.queries += stats.count
+        metrics.seconds += stats.seconds
+        if n_plus_one:
+            metrics.n_plus_one += 1
+
+
+sql_metrics = SQLMetrics()
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_start"].pop()
+
+    stats = request_sql_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+
+    # Only the statement text is logged, never its parameters.
+    if seconds * 1000 >= SQL_SLOW_QUERY_MS:
+        sql_metrics.slow_queries += 1
+        if random.random() < SQL_SLOW_QUERY_SAMPLE_RATE:
+            logger.warning("Slow query (%.1f ms): %s", seconds * 1000, statement_summary(statement, 1000))
+
+
+def handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute.
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: AsyncEngine):
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(sync_engine, "handle_error", handle_error)
+
+
+def header_value(value: str) -> bytes:
+    return value.encode("latin-1", errors="replace")
+
+
+class SQLStatsMiddleware:
+    """Collects the SQL run by each request; logs N+1 patterns, feeds the
+    per-route SQL metrics and, with SQL_STATS_HEADERS on, adds X-DB-* headers.
+    Headers can only cover statements run before the response starts, which
+    for streaming responses is not all of them."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSQLStats()
+        token = request_sql_stats.set(stats)
+
+        async def send_wrapper(message):
+            if SQL_STATS_HEADERS and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode("ascii")))
+                headers.append((b"x-db-time-ms", f"{stats.seconds * 1000:.2f}".encode("ascii")))
+                if stats.slowest:
+                    headers.append((b"x-db-slowest", header_value(" | ".join(
+                        f"{seconds * 1000:.2f}ms {statement_summary(statement)}"
+                        for seconds, statement in stats.slowest
+                    ))))
+                repeated = stats.repeated_statements()
+                if repeated:
+                    headers.append((b"x-db-repeated-statements", header_value(" | ".join(
+                        f"{count}x {statement_summary(statement)}" for statement, count in repeated
+                    ))))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_sql_stats.reset(token)
+            route_path = route_label(scope)
+
+            repeated = stats.repeated_statements()
+            for statement, count in repeated:
+                logger.warning(
+                    "Possible N+1 in %s %s: statement ran %s times: %s",
+                    scope["method"], route_path, count, statement_summary(statement, 300)
+                )
+            sql_metrics.record(scope["method"], route_path, stats, bool(repeated))
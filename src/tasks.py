@@ -0,0 +1,370 @@
+import asyncio
+import heapq
+import logging
+import time
+from collections import Counter
+
+from sqlalchemy import Integer, column, func, select, text, update, values
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from config import (
+    AUTO_ASSIGN_ENABLED,
+    AUTO_ASSIGN_BATCH_SIZE,
+    AUTO_ASSIGN_INTERVAL_SECONDS,
+    AUTO_ASSIGN_RESYNC_SECONDS,
+    JOB_RUNNER_CONCURRENCY,
+    JOB_QUEUE_SIZE,
+    JOB_DRAIN_TIMEOUT_SECONDS,
+    DB_REPLICA_CHECK_INTERVAL,
+)
+from src.database import async_sessionmaker, dedicated_engine, replica_health
+from src.core.counters import apply_ticket_counter_deltas
+from src.events import notify_ticket_events, ticket_changed_event
+from src.core.enums import TicketStatus, UserRole
+from src.core.models import Ticket, TicketCounter, User
+
+logger = logging.getLogger(__name__)
+
+
+class JobStats:
+    def __init__(self):
+        self.runs = 0
+        self.failures = 0
+        self.duration_seconds_total = 0.0
+        self.duration_seconds_max = 0.0
+
+    def record(self, duration: float, failed: bool):
+        self.runs += 1
+        if failed:
+            self.failures += 1
+        self.duration_seconds_total += duration
+        self.duration_seconds_max = max(self.duration_seconds_max, duration)
+
+
+class JobRunner:
+    """Runs coroutine jobs off the request path on a fixed number of workers.
+
+    submit() never waits: when the queue is full, or the runner is not started
+    (scripts, benchmarks without a lifespan), the job is dropped and False is
+    returned, so only work that may be skipped or retried later belongs here.
+    """
+
+    def __init__(self, concurrency: int, queue_size: int, drain_timeout: float):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.drain_timeout = drain_timeout
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.periodic_jobs = []
+        self.tasks = []
+        self.schedulers = []
+        self.accepting = False
+        self.running = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.pending = Counter()
+        self.job_stats = {}
+
+    def add_periodic(self, name: str, interval: float, func):
+        self.periodic_jobs.append((name, interval, func))
+
+    def submit(self, name: str, func, *args, unique: bool = False) -> bool:
+        # unique jobs are skipped while one with the same name is queued or running.
+        if not self.accepting or (unique and self.pending[name]):
+            self.rejected += 1
+            return False
+        try:
+            self.queue.put_nowait((name, func, args))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            logger.warning("Job queue is full, dropped %s", name)
+            return False
+        self.pending[name] += 1
+        self.submitted += 1
+        return True
+
+    async def worker(self):
+        while True:
+            name, func, args = await self.queue.get()
+            self.running += 1
+            start = time.perf_counter()
+            failed = False
+            try:
+                await func(*args)
+            except Exception:
+                failed = True
+                logger.exception("Background job %s failed", name)
+            finally:
+                self.running -= 1
+                self.pending[name] -= 1
+                self.job_stats.setdefault(name, JobStats()).record(time.perf_counter() - start, failed)
+                self.queue.task_done()
+
+    async def schedule(self, name: str, interval: float, func):
+        while True:
+            self.submit(name, func, unique=True)
+            await asyncio.sleep(interval)
+
+    async def start(self):
+        self.accepting = True
+        self.tasks = [asyncio.create_task(self.worker()) for _ in range(self.concurrency)]
+        self.schedulers = [
+            asyncio.create_task(self.schedule(name, interval, func))
+            for name, interval, func in self.periodic_jobs
+        ]
+
+    async def stop(self):
+        # Stop taking work, let queued and running jobs finish within the drain
+        # timeout, then cancel whatever is left.
+        self.accepting = False
+        for task in self.schedulers:
+            task.cancel()
+        try:
+            async with asyncio.timeout(self.drain_timeout):
+                await self.queue.join()
+        except TimeoutError:
+            logger.warning("Job runner drain timed out with %s jobs queued", self.queue.qsize())
+
+        for task in self.tasks + self.schedulers:
+            task.cancel()
+        await asyncio.gather(*self.tasks, *self.schedulers, return_exceptions=True)
+        self.tasks = []
+        self.schedulers = []
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue_size,
+            "running": self.running,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "jobs": {
+                name: {
+                    "runs": stats.runs,
+                    "failures": stats.failures,
+                    "duration_seconds_total": stats.duration_seconds_total,
+                    "duration_seconds_max": stats.duration_seconds_max,
+                }
+                for name, stats in self.job_stats.items()
+            },
+        }
+
+
+# Statuses that count towards a worker's load.
+OPEN_TICKET_STATUSES = (TicketStatus.NEW, TicketStatus.IN_PROGRESS)
+
+# Key of the session-level advisory lock held by the process that assigns.
+AUTO_ASSIGN_LOCK_KEY = 0x7A551C4E
+
+
+class WorkerLoadBalancer:
+    """Min-heap of (open tickets, worker id); ties go to the lower id."""
+
+    def __init__(self):
+        self.heap = []
+
+    def reset(self, loads: dict[int, int]):
+        self.heap = [(load, worker_id) for worker_id, load in loads.items()]
+        heapq.heapify(self.heap)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def loads(self) -> dict[int, int]:
+        return {worker_id: load for load, worker_id in self.heap}
+
+    def take(self, count: int) -> list[int]:
+        # Each pick goes to the least loaded worker, whose load then grows by one.
+        if not self.heap:
+            return []
+
+        picks = []
+        for _ in range(count):
+            load, worker_id = self.heap[0]
+            heapq.heapreplace(self.heap, (load + 1, worker_id))
+            picks.append(worker_id)
+        return picks
+
+
+class AutoAssigner:
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        session_factory,
+        batch_size: int,
+        resync_interval: float,
+        lock_key: int = AUTO_ASSIGN_LOCK_KEY
+    ):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.resync_interval = resync_interval
+        self.lock_key = lock_key
+        self.balancer = WorkerLoadBalancer()
+        self.lock_connection: AsyncConnection | None = None
+        self.synced_at = None
+        self.assigned_total = 0
+
+    @property
+    def is_leader(self) -> bool:
+        return self.lock_connection is not None
+
+    async def acquire_leadership(self) -> bool:
+        # The lock lives as long as this connection, held in autocommit mode for
+        # as long as this process leads. It comes from dedicated_engine, so it
+        # does not take a slot of the request pool; if the process dies
+        # Postgres releases the lock.
+        if self.lock_connection is not None:
+            try:
+                await self.lock_connection.execute(text("SELECT 1"))
+                return True
+            except Exception:
+                await self.release_leadership()
+
+        connection = await self.engine.connect()
+        try:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            result = await connection.execute(select(func.pg_try_advisory_lock(self.lock_key)))
+            acquired = result.scalar()
+        except Exception:
+            await connection.close()
+            raise
+
+        if not acquired:
+            await connection.close()
+            return False
+
+        self.lock_connection = connection
+        self.synced_at = None
+        return True
+
+    async def release_leadership(self):
+        connection, self.lock_connection = self.lock_connection, None
+        if connection is None:
+            return
+        try:
+            await connection.execute(select(func.pg_advisory_unlock(self.lock_key)))
+        except Exception:
+            pass
+        try:
+            await connection.close()
+        except Exception:
+            await connection.invalidate()
+
+    async def resync(self, db_session: AsyncSession):
+        # Loads come from the ticket_counters read model, so completed work and
+        # manual assignments since the last sync are picked up here.
+        stmt = (
+            select(User.id, func.coalesce(func.sum(TicketCounter.count), 0))
+            .outerjoin(
+                TicketCounter,
+                (TicketCounter.assigned_to_id == User.id) & TicketCounter.status.in_(OPEN_TICKET_STATUSES)
+            )
+            .where(User.role == UserRole.WORKER, User.is_active.is_(True))
+            .group_by(User.id)
+        )
+        result = await db_session.execute(stmt)
+        self.balancer.reset({worker_id: load for worker_id, load in result.all()})
+        self.synced_at = time.monotonic()
+
+    async def assign_batch(self, db_session: AsyncSession) -> int:
+        if not self.balancer:
+            return 0
+
+        # SKIP LOCKED leaves tickets an admin is assigning right now for the next round.
+        pending = await db_session.execute(
+            select(Ticket.id)
+            .where(Ticket.status == TicketStatus.NEW, Ticket.assigned_to_id.is_(None))
+            .order_by(Ticket.created_at, Ticket.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        ticket_ids = pending.scalars().all()
+        if not ticket_ids:
+            return 0
+
+        worker_ids = self.balancer.take(len(ticket_ids))
+        assignments = values(
+            column("ticket_id", Integer), column("worker_id", Integer), name="assignments"
+        ).data(list(zip(ticket_ids, worker_ids)))
+        result = await db_session.execute(
+            update(Ticket.__table__)
+            .where(Ticket.id == assignments.c.ticket_id)
+            .values(assigned_to_id=assignments.c.worker_id)
+            .returning(*Ticket.__table__.c["id", "title", "status", "assigned_to_id", "updated_at"])
+        )
+        await notify_ticket_events(db_session, [
+            ticket_changed_event(row, TicketStatus.NEW, None) for row in result.all()
+        ])
+
+        deltas = Counter({(TicketStatus.NEW, None): -len(ticket_ids)})
+        for worker_id in worker_ids:
+            deltas[(TicketStatus.NEW, worker_id)] += 1
+        await apply_ticket_counter_deltas(db_session, deltas)
+        await db_session.commit()
+
+        self.assigned_total += len(ticket_ids)
+        return len(ticket_ids)
+
+    async def run_once(self) -> int:
+        try:
+            return await self.assign_pending()
+        except Exception:
+            # Hand the lock over in case the lock connection is what broke.
+            await self.release_leadership()
+            raise
+
+    async def assign_pending(self) -> int:
+        if not await self.acquire_leadership():
+            return 0
+
+        assigned = 0
+        async with self.session_factory() as session:
+            if self.synced_at is None or time.monotonic() - self.synced_at >= self.resync_interval:
+                await self.resync(session)
+                await session.commit()
+
+            while True:
+                try:
+                    count = await self.assign_batch(session)
+                except Exception:
+                    # The in-memory loads already counted the failed batch.
+                    self.synced_at = None
+                    raise
+                assigned += count
+                if count < self.batch_size:
+                    break
+        return assigned
+
+    def stats(self) -> dict:
+        loads = self.balancer.loads()
+        return {
+            "leader": self.is_leader,
+            "workers": len(loads),
+            "assigned_total": self.assigned_total,
+            "max_load": max(loads.values(), default=0),
+            "min_load": min(loads.values(), default=0),
+        }
+
+
+auto_assigner = AutoAssigner(
+    dedicated_engine,
+    async_sessionmaker,
+    batch_size=AUTO_ASSIGN_BATCH_SIZE,
+    resync_interval=AUTO_ASSIGN_RESYNC_SECONDS,
+)
+
+job_runner = JobRunner(JOB_RUNNER_CONCURRENCY, JOB_QUEUE_SIZE, JOB_DRAIN_TIMEOUT_SECONDS)
+
+if replica_health is not None:
+    job_runner.add_periodic("replica_health", DB_REPLICA_CHECK_INTERVAL, replica_health.check)
+
+if AUTO_ASSIGN_ENABLED:
+    job_runner.add_periodic("auto_assign", AUTO_ASSIGN_INTERVAL_SECONDS, auto_assigner.run_once)
+
+
+def schedule_auto_assign():
+    # Assign fresh intake right away instead of waiting for the next round;
+    # only the process holding the lock can do anything with it.
+    if AUTO_ASSIGN_ENABLED and auto_assigner.is_leader:
+        job_runner.submit("auto_assign", auto_assigner.run_once, unique=True)